@@ -8,23 +8,31 @@ def migrate():
         print(f"Database {DB_NAME} not found!")
         return
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
+    # isolation_level=None: transactions are opened explicitly below
+    conn = sqlite3.connect(DB_NAME, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
     try:
+        # Single write transaction for the check and every DDL statement
+        conn.execute("BEGIN IMMEDIATE")
+
         # Check if column exists
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [info[1] for info in cursor.fetchall()]
-        
-        if "status" not in columns:
+        has_status = conn.execute(
+            "SELECT 1 FROM pragma_table_info('users') WHERE name = 'status'"
+        ).fetchone()
+
+        if not has_status:
             print("Adding status column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN status VARCHAR DEFAULT 'offline'")
-            conn.commit()
+            conn.execute("ALTER TABLE users ADD COLUMN status VARCHAR DEFAULT 'offline'")
             print("Migration successful: Added status column.")
         else:
             print("Status column already exists.")
-            
-    except Exception as e:
+
+        conn.execute("COMMIT")
+
+    except sqlite3.OperationalError as e:
         print(f"Error migrating database: {e}")
         conn.rollback()
     finally:
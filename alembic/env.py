@@ -0,0 +1,53 @@
+from alembic import context
+
+from app import models
+from app.database import engine
+
+config = context.config
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    def include_object(obj, name, type_, reflected, compare_to):
+        # Indexes declared with .ddl_if(dialect=...) only exist on that dialect
+        ddl_if = getattr(obj, "_ddl_if", None)
+        return ddl_if is None or ddl_if.dialect in (None, connection.dialect.name)
+
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        if connection.dialect.name == "postgresql":
+            # The app engine cancels statements after 5s; type changes and index
+            # builds on whole tables need longer. LOCAL: ends with this transaction.
+            connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+    with engine.connect() as connection:
+        do_run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,576 @@
+"""Baseline: the schema create_all built before migrations existed
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 23:25:31.725523
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases built by create_all before migrations existed already have these
+    # tables; recording the revision is enough here. The indexes create_all did
+    # not add to them are created by 0004.
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("users"):
+        return
+
+    op.create_table('app_settings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(), nullable=True),
+    sa.Column('value', sa.Text(), nullable=True),
+    sa.Column('is_secret', sa.Boolean(), nullable=True),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('app_settings', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_app_settings_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_app_settings_key'), ['key'], unique=True)
+
+    op.create_table('builder_pages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('widgets_json', sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True, astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('theme_json', sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True, astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('is_published', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('builder_pages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_builder_pages_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_builder_pages_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_builder_pages_slug'), ['slug'], unique=True)
+
+    op.create_table('product_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('icon', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('product_categories', schema=None) as batch_op:
+        batch_op.create_index('ix_product_categories_active', ['id'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+        batch_op.create_index(batch_op.f('ix_product_categories_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_product_categories_name'), ['name'], unique=True)
+        batch_op.create_index(batch_op.f('ix_product_categories_slug'), ['slug'], unique=True)
+
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('version', sa.String(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('checklist', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_projects_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_projects_title'), ['title'], unique=False)
+
+    op.create_table('roles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('permissions', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('roles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_roles_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_roles_name'), ['name'], unique=True)
+
+    op.create_table('subscription_plans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Integer(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('interval', sa.String(), nullable=True),
+    sa.Column('features', sa.Text(), nullable=True),
+    sa.Column('stripe_product_id', sa.String(), nullable=True),
+    sa.Column('stripe_price_id', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_popular', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('subscription_plans', schema=None) as batch_op:
+        batch_op.create_index('ix_subscription_plans_active_sort_order', ['sort_order'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+        batch_op.create_index(batch_op.f('ix_subscription_plans_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_subscription_plans_name'), ['name'], unique=False)
+
+    op.create_table('comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_comments_id'), ['id'], unique=False)
+
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Integer(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('product_type', sa.String(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('stock', sa.Integer(), nullable=True),
+    sa.Column('stripe_product_id', sa.String(), nullable=True),
+    sa.Column('stripe_price_id', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['product_categories.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_active_slug', ['slug'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+        batch_op.create_index(batch_op.f('ix_products_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_slug'), ['slug'], unique=True)
+
+    op.create_table('review_threads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('tool_id', sa.String(), nullable=True),
+    sa.Column('selection_json', sa.String(), nullable=True),
+    sa.Column('coordinates', sa.String(), nullable=True),
+    sa.Column('context_type', sa.String(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('review_threads', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_review_threads_id'), ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('role_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_username'), ['username'], unique=True)
+
+    op.create_table('activity_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('page_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('resource_type', sa.String(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['page_id'], ['builder_pages.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_activity_logs_id'), ['id'], unique=False)
+        batch_op.create_index('ix_activity_logs_page_timestamp_id', ['page_id', sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False)
+        batch_op.create_index('ix_activity_logs_timestamp_id', [sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False)
+
+    op.create_table('articles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('excerpt', sa.Text(), nullable=True),
+    sa.Column('cover_image', sa.String(), nullable=True),
+    sa.Column('status', sa.Enum('DRAFT', 'IN_REVIEW', 'CHANGES_REQUESTED', 'APPROVED', 'PUBLISHED', 'ARCHIVED', name='articlestatus'), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('tags', sa.String(), nullable=True),
+    sa.Column('author_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_articles_category'), ['category'], unique=False)
+        batch_op.create_index('ix_articles_created_at_id', [sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+        batch_op.create_index(batch_op.f('ix_articles_id'), ['id'], unique=False)
+        batch_op.create_index('ix_articles_published_at_id', [sa.literal_column('published_at DESC'), sa.literal_column('id DESC')], unique=False)
+        batch_op.create_index(batch_op.f('ix_articles_slug'), ['slug'], unique=True)
+        batch_op.create_index(batch_op.f('ix_articles_title'), ['title'], unique=False)
+
+    op.create_table('chat_channels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('channel_type', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('is_archived', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('chat_channels', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chat_channels_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_chat_channels_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_chat_channels_slug'), ['slug'], unique=True)
+
+    op.create_table('chat_messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chat_messages_id'), ['id'], unique=False)
+        batch_op.create_index('ix_chat_messages_timestamp_id', [sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False)
+
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('total_amount', sa.Integer(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('stripe_session_id', sa.String(), nullable=True),
+    sa.Column('stripe_payment_intent_id', sa.String(), nullable=True),
+    sa.Column('shipping_address', sa.Text(), nullable=True),
+    sa.Column('billing_address', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_orders_id'), ['id'], unique=False)
+
+    op.create_table('review_comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('thread_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('author_id', sa.Integer(), nullable=True),
+    sa.Column('author_name', sa.String(), nullable=True),
+    sa.Column('edited_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=True),
+    sa.Column('dislikes', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['thread_id'], ['review_threads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('review_comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_review_comments_id'), ['id'], unique=False)
+
+    op.create_table('user_subscriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('plan_id', sa.Integer(), nullable=True),
+    sa.Column('stripe_subscription_id', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('current_period_start', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('current_period_end', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['plan_id'], ['subscription_plans.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user_subscriptions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_subscriptions_id'), ['id'], unique=False)
+
+    op.create_table('workflows',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('trigger_type', sa.String(), nullable=True),
+    sa.Column('trigger_config', sa.Text(), nullable=True),
+    sa.Column('nodes_json', sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True, astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('edges_json', sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True, astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('workflows', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_workflows_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_workflows_name'), ['name'], unique=False)
+
+    op.create_table('article_reviews',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=True),
+    sa.Column('reviewer_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('article_reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_reviews_id'), ['id'], unique=False)
+
+    op.create_table('channel_members',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('channel_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notifications_enabled', sa.Boolean(), nullable=True),
+    sa.Column('sound_enabled', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['channel_id'], ['chat_channels.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('channel_members', schema=None) as batch_op:
+        batch_op.create_index('ix_channel_members_channel_user', ['channel_id', 'user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_channel_members_id'), ['id'], unique=False)
+
+    op.create_table('channel_messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('channel_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('edited_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_system_message', sa.Boolean(), nullable=True),
+    sa.Column('reply_to_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['channel_id'], ['chat_channels.id'], ),
+    sa.ForeignKeyConstraint(['reply_to_id'], ['channel_messages.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('channel_messages', schema=None) as batch_op:
+        batch_op.create_index('ix_channel_messages_channel_timestamp_user', ['channel_id', sa.literal_column('timestamp DESC'), 'user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_channel_messages_id'), ['id'], unique=False)
+
+    op.create_table('order_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('unit_price', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_items_id'), ['id'], unique=False)
+
+    op.create_table('workflow_executions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workflow_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('input_data', sa.Text(), nullable=True),
+    sa.Column('output_data', sa.Text(), nullable=True),
+    sa.Column('execution_log', sa.Text(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('current_node_id', sa.String(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['workflow_id'], ['workflows.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('workflow_executions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_workflow_executions_id'), ['id'], unique=False)
+        batch_op.create_index('ix_workflow_executions_workflow_started_id', ['workflow_id', sa.literal_column('started_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_include=['status', 'completed_at'])
+
+    op.create_table('message_attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('message_id', sa.Integer(), nullable=True),
+    sa.Column('file_url', sa.String(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=False),
+    sa.Column('file_name', sa.String(), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['message_id'], ['channel_messages.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('message_attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_message_attachments_id'), ['id'], unique=False)
+
+    op.create_table('message_reactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('message_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('emoji', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['message_id'], ['channel_messages.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('message_reactions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_message_reactions_id'), ['id'], unique=False)
+        batch_op.create_index('ix_message_reactions_message_user_emoji', ['message_id', 'user_id', 'emoji'], unique=True)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('message_reactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_reactions_message_user_emoji')
+        batch_op.drop_index(batch_op.f('ix_message_reactions_id'))
+
+    op.drop_table('message_reactions')
+    with op.batch_alter_table('message_attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_message_attachments_id'))
+
+    op.drop_table('message_attachments')
+    with op.batch_alter_table('workflow_executions', schema=None) as batch_op:
+        batch_op.drop_index('ix_workflow_executions_workflow_started_id', postgresql_include=['status', 'completed_at'])
+        batch_op.drop_index(batch_op.f('ix_workflow_executions_id'))
+
+    op.drop_table('workflow_executions')
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_items_id'))
+
+    op.drop_table('order_items')
+    with op.batch_alter_table('channel_messages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_channel_messages_id'))
+        batch_op.drop_index('ix_channel_messages_channel_timestamp_user')
+
+    op.drop_table('channel_messages')
+    with op.batch_alter_table('channel_members', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_channel_members_id'))
+        batch_op.drop_index('ix_channel_members_channel_user')
+
+    op.drop_table('channel_members')
+    with op.batch_alter_table('article_reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_reviews_id'))
+
+    op.drop_table('article_reviews')
+    with op.batch_alter_table('workflows', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_workflows_name'))
+        batch_op.drop_index(batch_op.f('ix_workflows_id'))
+
+    op.drop_table('workflows')
+    with op.batch_alter_table('user_subscriptions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_subscriptions_id'))
+
+    op.drop_table('user_subscriptions')
+    with op.batch_alter_table('review_comments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_review_comments_id'))
+
+    op.drop_table('review_comments')
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_orders_id'))
+
+    op.drop_table('orders')
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_messages_timestamp_id')
+        batch_op.drop_index(batch_op.f('ix_chat_messages_id'))
+
+    op.drop_table('chat_messages')
+    with op.batch_alter_table('chat_channels', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chat_channels_slug'))
+        batch_op.drop_index(batch_op.f('ix_chat_channels_name'))
+        batch_op.drop_index(batch_op.f('ix_chat_channels_id'))
+
+    op.drop_table('chat_channels')
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_articles_title'))
+        batch_op.drop_index(batch_op.f('ix_articles_slug'))
+        batch_op.drop_index('ix_articles_published_at_id')
+        batch_op.drop_index(batch_op.f('ix_articles_id'))
+        batch_op.drop_index('ix_articles_created_at_id')
+        batch_op.drop_index(batch_op.f('ix_articles_category'))
+
+    op.drop_table('articles')
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_logs_timestamp_id')
+        batch_op.drop_index('ix_activity_logs_page_timestamp_id')
+        batch_op.drop_index(batch_op.f('ix_activity_logs_id'))
+
+    op.drop_table('activity_logs')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('review_threads', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_review_threads_id'))
+
+    op.drop_table('review_threads')
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_slug'))
+        batch_op.drop_index(batch_op.f('ix_products_name'))
+        batch_op.drop_index(batch_op.f('ix_products_id'))
+        batch_op.drop_index('ix_products_active_slug', postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+
+    op.drop_table('products')
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comments_id'))
+
+    op.drop_table('comments')
+    with op.batch_alter_table('subscription_plans', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_subscription_plans_name'))
+        batch_op.drop_index(batch_op.f('ix_subscription_plans_id'))
+        batch_op.drop_index('ix_subscription_plans_active_sort_order', postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+
+    op.drop_table('subscription_plans')
+    with op.batch_alter_table('roles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_roles_name'))
+        batch_op.drop_index(batch_op.f('ix_roles_id'))
+
+    op.drop_table('roles')
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_projects_title'))
+        batch_op.drop_index(batch_op.f('ix_projects_id'))
+
+    op.drop_table('projects')
+    with op.batch_alter_table('product_categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_product_categories_slug'))
+        batch_op.drop_index(batch_op.f('ix_product_categories_name'))
+        batch_op.drop_index(batch_op.f('ix_product_categories_id'))
+        batch_op.drop_index('ix_product_categories_active', postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true())
+
+    op.drop_table('product_categories')
+    with op.batch_alter_table('builder_pages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_builder_pages_slug'))
+        batch_op.drop_index(batch_op.f('ix_builder_pages_name'))
+        batch_op.drop_index(batch_op.f('ix_builder_pages_id'))
+
+    op.drop_table('builder_pages')
+    with op.batch_alter_table('app_settings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_app_settings_key'))
+        batch_op.drop_index(batch_op.f('ix_app_settings_id'))
+
+    op.drop_table('app_settings')
@@ -0,0 +1,41 @@
+"""Index comment and review lookups by parent
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 23:28:35.102232
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_project_id_id', ['project_id', 'id'], unique=False)
+
+    with op.batch_alter_table('review_comments', schema=None) as batch_op:
+        batch_op.create_index('ix_review_comments_thread_id_id', ['thread_id', 'id'], unique=False)
+
+    with op.batch_alter_table('review_threads', schema=None) as batch_op:
+        batch_op.create_index('ix_review_threads_project_id_id', ['project_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('review_threads', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_threads_project_id_id')
+
+    with op.batch_alter_table('review_comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_comments_thread_id_id')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_project_id_id')
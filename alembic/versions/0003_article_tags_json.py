@@ -0,0 +1,60 @@
+"""Store article tags as a JSON list instead of a comma-separated string
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name == "postgresql":
+        # Blank strings become NULL, "a, b" becomes ["a", "b"]
+        op.execute(
+            "ALTER TABLE articles ALTER COLUMN tags TYPE JSONB USING CASE "
+            "WHEN btrim(coalesce(tags, '')) = '' THEN NULL "
+            "ELSE to_jsonb(array_remove(regexp_split_to_array(btrim(tags), '\\s*,\\s*'), '')) END"
+        )
+        op.create_index('ix_articles_tags', 'articles', ['tags'], unique=False, postgresql_using='gin')
+        return
+
+    bind = op.get_bind()
+    articles = sa.table('articles', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+    rows = bind.execute(sa.select(articles.c.id, articles.c.tags).where(articles.c.tags.is_not(None))).all()
+    for article_id, tags in rows:
+        values = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        bind.execute(
+            articles.update()
+            .where(articles.c.id == article_id)
+            .values(tags=json.dumps(values) if values else None)
+        )
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.alter_column('tags', existing_type=sa.String(), type_=sa.JSON(none_as_null=True), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == "postgresql":
+        op.drop_index('ix_articles_tags', table_name='articles', postgresql_using='gin')
+        joined = "(SELECT string_agg(value, ',') FROM jsonb_array_elements_text(tags))"
+    else:
+        joined = "(SELECT group_concat(value, ',') FROM json_each(tags))"
+
+    # ALTER ... USING cannot take a subquery, so go through a scratch column
+    op.add_column('articles', sa.Column('tags_text', sa.String(), nullable=True))
+    op.execute(f"UPDATE articles SET tags_text = {joined} WHERE tags IS NOT NULL")
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_column('tags')
+        batch_op.alter_column('tags_text', new_column_name='tags')
@@ -0,0 +1,42 @@
+"""Backfill indexes on databases that predate migrations
+
+Databases built by create_all were stamped at the baseline without running it,
+so they lack the indexes it declares. Fresh databases already have them from
+0001, hence IF NOT EXISTS.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activity_logs_timestamp_id', 'activity_logs', [sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False, if_not_exists=True)
+    op.create_index('ix_articles_created_at_id', 'articles', [sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False, if_not_exists=True)
+    op.create_index('ix_articles_published_at_id', 'articles', [sa.literal_column('published_at DESC'), sa.literal_column('id DESC')], unique=False, if_not_exists=True)
+    op.create_index('ix_activity_logs_page_timestamp_id', 'activity_logs', ['page_id', sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False, if_not_exists=True)
+    op.create_index('ix_chat_messages_timestamp_id', 'chat_messages', [sa.literal_column('timestamp DESC'), sa.literal_column('id DESC')], unique=False, if_not_exists=True)
+    op.create_index('ix_channel_members_channel_user', 'channel_members', ['channel_id', 'user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_channel_messages_channel_timestamp_user', 'channel_messages', ['channel_id', sa.literal_column('timestamp DESC'), 'user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_workflow_executions_workflow_started_id', 'workflow_executions', ['workflow_id', sa.literal_column('started_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_include=['status', 'completed_at'], if_not_exists=True)
+    op.create_index('ix_product_categories_active', 'product_categories', ['id'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true(), if_not_exists=True)
+    op.create_index('ix_products_active_slug', 'products', ['slug'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true(), if_not_exists=True)
+    op.create_index('ix_subscription_plans_active_sort_order', 'subscription_plans', ['sort_order'], unique=False, postgresql_where=sa.column('is_active') == sa.true(), sqlite_where=sa.column('is_active') == sa.true(), if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: on databases created from 0001 these indexes belong to the baseline
+    pass
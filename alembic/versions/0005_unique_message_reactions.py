@@ -0,0 +1,34 @@
+"""Make message reactions unique per (message, user, emoji)
+
+The reaction toggle upserts against this index. Databases that predate it may
+hold duplicate rows from double-clicks, so those are collapsed to the oldest first.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "DELETE FROM message_reactions WHERE id NOT IN ("
+        "SELECT MIN(id) FROM message_reactions GROUP BY message_id, user_id, emoji)"
+    )
+    op.create_index('ix_message_reactions_message_user_emoji', 'message_reactions', ['message_id', 'user_id', 'emoji'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: on databases created from 0001 the index belongs to the baseline
+    pass
@@ -0,0 +1,47 @@
+"""Store builder page widgets and theme as JSON/JSONB
+
+create_all databases still hold these as TEXT. Casting through text makes the
+upgrade a no-op on columns the baseline already created as JSONB.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('widgets_json', 'theme_json')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name == "postgresql":
+        for column in COLUMNS:
+            op.execute(
+                f"ALTER TABLE builder_pages ALTER COLUMN {column} DROP DEFAULT, "
+                f"ALTER COLUMN {column} TYPE JSONB USING NULLIF({column}::text, '')::jsonb"
+            )
+        return
+
+    # SQLite keeps JSON as text; only blanks would fail to decode
+    for column in COLUMNS:
+        op.execute(f"UPDATE builder_pages SET {column} = NULL WHERE {column} = ''")
+    with op.batch_alter_table('builder_pages', schema=None) as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_type=sa.Text(), type_=sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True, astext_type=sa.Text()), 'postgresql'), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: on databases created from 0001 these columns were JSON from the start
+    pass
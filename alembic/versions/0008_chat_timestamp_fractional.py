@@ -0,0 +1,44 @@
+"""Store SQLite chat timestamps with fractional seconds
+
+Tables created before migrations default chat_messages.timestamp to
+CURRENT_TIMESTAMP ('YYYY-MM-DD HH:MM:SS'), while keyset cursors bind
+'YYYY-MM-DD HH:MM:SS.ffffff'. As text those compare wrongly, and the chat
+history kept returning its last page. PostgreSQL stores real timestamps and
+needs nothing.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
+    # Same layout SQLAlchemy writes for DateTime: six fractional digits
+    op.execute(
+        "UPDATE chat_messages SET timestamp = STRFTIME('%Y-%m-%d %H:%M:%f000', timestamp) "
+        "WHERE timestamp IS NOT NULL AND timestamp NOT LIKE '%.%'"
+    )
+    # func.now() renders the fractional STRFTIME default on SQLite (see app/database.py)
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(timezone=True), server_default=sa.func.now(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to undo: fractional values and the default are what 0001 creates
+    pass
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..database import get_db
 from ..models.base_models import ActivityLog
+from ..pagination import MAX_PAGE_SIZE, Page, stream_page
 
 from pydantic import BaseModel
 from datetime import datetime
@@ -18,28 +19,38 @@ class ActivityLogOut(BaseModel):
     user_id: Optional[int]
     project_id: Optional[int]
     page_id: Optional[int]
-    action: str
+    action: Optional[str]
     details: Optional[str]
-    resource_type: str
-    timestamp: datetime
+    resource_type: Optional[str]
+    timestamp: Optional[datetime]
     
     # Optionally include user name if needed (simple for now)
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
-@router.get("/", response_model=List[ActivityLogOut])
-def get_activity_logs(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[ActivityLogOut])
+def get_activity_logs(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
     Get global activity logs, ordered by timestamp desc.
+    Pass `next_cursor` back as `cursor` to fetch the following page.
     """
-    logs = db.query(ActivityLog).order_by(ActivityLog.timestamp.desc()).offset(skip).limit(limit).all()
-    return logs
+    return stream_page(db.query(ActivityLog), ActivityLog.timestamp, ActivityLog.id, limit, ActivityLogOut, cursor=cursor)
 
-@router.get("/page/{page_id}", response_model=List[ActivityLogOut])
-def get_page_activity(page_id: int, db: Session = Depends(get_db)):
+@router.get("/page/{page_id}", response_model=Page[ActivityLogOut])
+def get_page_activity(
+    page_id: int,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Get activity for a specific page.
+    Get activity for a specific page, ordered by timestamp desc.
+    Pass `next_cursor` back as `cursor` to fetch the following page.
     """
-    logs = db.query(ActivityLog).filter(ActivityLog.page_id == page_id).order_by(ActivityLog.timestamp.desc()).all()
-    return logs
+    query = db.query(ActivityLog).filter(ActivityLog.page_id == page_id)
+    return stream_page(query, ActivityLog.timestamp, ActivityLog.id, limit, ActivityLogOut, cursor=cursor)
@@ -1,39 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import exists, func, update
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from typing import List, Optional
-from datetime import datetime
 
 from .. import schemas, models
-from ..database import get_db
+from ..database import dialect_insert, get_db, utcnow
 from ..auth import get_current_user
+from ..cache import TTLCache
+from ..pagination import MAX_PAGE_SIZE, Page, paginate, stream_page
+from ..responses import etag_matches
 
 router = APIRouter()
 
+# schemas.Article nests author (with role) and reviews (with reviewer); load them
+# up front so serializing a list does not fire one SELECT per row.
+ARTICLE_LOAD_OPTIONS = (
+    selectinload(models.Article.author).joinedload(models.User.role),
+    selectinload(models.Article.reviews).selectinload(models.ArticleReview.reviewer).joinedload(models.User.role),
+)
+
+# List views skip the (potentially large) content column and the reviews
+ARTICLE_LIST_OPTIONS = (
+    load_only(
+        models.Article.id, models.Article.title, models.Article.slug, models.Article.excerpt,
+        models.Article.cover_image, models.Article.status, models.Article.category, models.Article.tags,
+        models.Article.author_id, models.Article.created_at, models.Article.updated_at,
+        models.Article.published_at,
+    ),
+    selectinload(models.Article.author).joinedload(models.User.role),
+)
+
+# Serialized article-by-slug responses: slug -> (etag, json body, published)
+_slug_cache = TTLCache(maxsize=1024, ttl=60)
+SLUG_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Drafts and articles under review: the browser may keep a copy but must revalidate,
+# and shared caches / CDNs must not store them
+SLUG_PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+# Serialized public listing pages: (category, cursor, limit) -> json body
+_public_list_cache = TTLCache(maxsize=256, ttl=30)
+PublicArticlePage = Page[schemas.ArticleListItem]
+
+def _invalidate_article_cache(*slugs):
+    for slug in slugs:
+        _slug_cache.pop(slug)
+    _public_list_cache.clear()
+
+# Roles allowed to edit any article; everyone else only edits their own
+EDITOR_ROLES = frozenset({"admin", "editor"})
+
+def _scope_to_author(stmt, current_user: models.User):
+    """Restrict an article query/UPDATE to the caller's own rows unless they are an editor."""
+    if current_user.role.name not in EDITOR_ROLES:
+        stmt = stmt.where(models.Article.author_id == current_user.id)
+    return stmt
+
+def _article_not_editable(db: Session, article_id: int) -> HTTPException:
+    """Error for a scoped lookup that matched nothing: 404 if the row is missing, else 403."""
+    if db.query(exists().where(models.Article.id == article_id)).scalar():
+        return HTTPException(status_code=403, detail="Not authorized to edit this article")
+    return HTTPException(status_code=404, detail="Article not found")
+
 # --- Public Endpoints ---
 
-@router.get("/public", response_model=List[schemas.Article])
+@router.get("/public", response_model=PublicArticlePage)
 def get_public_articles(
-    skip: int = 0, 
-    limit: int = 10, 
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
     category: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Article).filter(models.Article.status == models.ArticleStatus.PUBLISHED)
-    if category:
-        query = query.filter(models.Article.category == category)
-    return query.order_by(models.Article.published_at.desc()).offset(skip).limit(limit).all()
+    key = (category, cursor, limit)
+    body = _public_list_cache.get(key)
+    if body is None:
+        query = db.query(models.Article).options(*ARTICLE_LIST_OPTIONS).filter(models.Article.status == models.ArticleStatus.PUBLISHED)
+        if category:
+            query = query.filter(models.Article.category == category)
+        page = paginate(query, models.Article.published_at, models.Article.id, limit, cursor=cursor)
+        body = PublicArticlePage.model_validate(page).model_dump_json().encode()
+        _public_list_cache.set(key, body)
+    return Response(content=body, media_type="application/json")
 
 @router.get("/slug/{slug}", response_model=schemas.Article)
-def get_article_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_article_by_slug(slug: str, request: Request, db: Session = Depends(get_db)):
     # Allow fetching by slug even if not published? Maybe for preview?
     # For now, public endpoint implies published only, or any if generic reader?
     # Let's restrict to PUBLISHED if user relies on this for public view. 
     # But for Admin/Preview we might need another way.
     # Let's just return it and let frontend handle "Not Published" warning if needed.
-    article = db.query(models.Article).filter(models.Article.slug == slug).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    cached = _slug_cache.get(slug)
+    if cached is None:
+        article = db.query(models.Article).options(*ARTICLE_LOAD_OPTIONS).filter(models.Article.slug == slug).first()
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        body = schemas.Article.model_validate(article).model_dump_json().encode()
+        published = article.status == models.ArticleStatus.PUBLISHED
+        cached = (f'"{hashlib.sha1(body).hexdigest()}"', body, published)
+        _slug_cache.set(slug, cached)
+
+    etag, body, published = cached
+    headers = {"ETag": etag, "Cache-Control": SLUG_CACHE_CONTROL if published else SLUG_PRIVATE_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # --- Protected Endpoints ---
 
@@ -43,34 +114,37 @@ def create_article(
     db: Session = Depends(get_db), 
     current_user: models.User = Depends(get_current_user)
 ):
-    # Check slug uniqueness
-    existing = db.query(models.Article).filter(models.Article.slug == article.slug).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Slug already registered")
-        
-    db_article = models.Article(
-        **article.dict(exclude={'status'}), # Force initial status logic?
-        status=models.ArticleStatus.DRAFT, # Always start as Draft
-        author_id=current_user.id
+    # Single statement: the unique slug index rejects duplicates, no check-then-insert race
+    stmt = (
+        dialect_insert(models.Article)
+        .values(
+            **article.dict(exclude={'status'}), # Force initial status logic?
+            status=models.ArticleStatus.DRAFT, # Always start as Draft
+            author_id=current_user.id
+        )
+        .on_conflict_do_nothing(index_elements=["slug"])
+        .returning(models.Article)
     )
-    db.add(db_article)
+    db_article = db.scalars(stmt).first()
+    if db_article is None:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Slug already registered")
     db.commit()
-    db.refresh(db_article)
     return db_article
 
-@router.get("", response_model=List[schemas.Article])
+@router.get("", response_model=Page[schemas.ArticleListItem])
 def get_articles(
-    skip: int = 0, 
-    limit: int = 100, 
-    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[models.ArticleStatus] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    query = db.query(models.Article)
+    query = db.query(models.Article).options(*ARTICLE_LIST_OPTIONS)
     if status:
         query = query.filter(models.Article.status == status)
     # Newest first
-    return query.order_by(models.Article.created_at.desc()).offset(skip).limit(limit).all()
+    return stream_page(query, models.Article.created_at, models.Article.id, limit, schemas.ArticleListItem, cursor=cursor)
 
 @router.get("/{article_id}", response_model=schemas.Article)
 def get_article(
@@ -78,7 +152,7 @@ def get_article(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    article = db.query(models.Article).filter(models.Article.id == article_id).first()
+    article = db.query(models.Article).options(*ARTICLE_LOAD_OPTIONS).filter(models.Article.id == article_id).first()
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     return article
@@ -90,52 +164,59 @@ def update_article(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_article = db.query(models.Article).filter(models.Article.id == article_id).first()
+    # Permission (Owner or Editor/Admin) is part of the WHERE clause
+    query = db.query(models.Article).filter(models.Article.id == article_id)
+    db_article = _scope_to_author(query, current_user).first()
     if not db_article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    # Check permission (Owner or Editor/Admin)
-    # Assuming any authenticated user can edit for now simplicty, or enforce:
-    if db_article.author_id != current_user.id and current_user.role.name not in ["admin", "editor"]:
-         raise HTTPException(status_code=403, detail="Not authorized to edit this article")
+        raise _article_not_editable(db, article_id)
 
     # Update fields
     update_data = article_update.dict(exclude_unset=True)
+    old_slug = db_article.slug
+
+    new_slug = update_data.get('slug')
+    if new_slug and new_slug != old_slug:
+        taken = exists().where(models.Article.slug == new_slug, models.Article.id != article_id)
+        if db.query(taken).scalar():
+            raise HTTPException(status_code=400, detail="Slug already registered")
     
     # Handle Status Change logic if needed, e.g. if setting to PUBLISHED set date
+    # (the DB keeps an existing published_at and stamps it with its own clock otherwise)
     if 'status' in update_data and update_data['status'] == models.ArticleStatus.PUBLISHED:
-        if not db_article.published_at:
-            db_article.published_at = datetime.utcnow()
+        db_article.published_at = func.coalesce(models.Article.published_at, utcnow())
     
     for key, value in update_data.items():
         setattr(db_article, key, value)
     
     db.commit()
     db.refresh(db_article)
+    _invalidate_article_cache(old_slug, db_article.slug)
     return db_article
 
 @router.post("/{article_id}/status", response_model=schemas.Article)
 def update_article_status(
     article_id: int,
-    status: str,
+    status: models.ArticleStatus,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    article = db.query(models.Article).filter(models.Article.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-        
     # Logic: Only Editor/Admin can APPROVE or PUBLISH
-    if status in [models.ArticleStatus.APPROVED, models.ArticleStatus.PUBLISHED]:
-        if current_user.role.name not in ["admin", "editor"]:
+    if status in (models.ArticleStatus.APPROVED, models.ArticleStatus.PUBLISHED):
+        if current_user.role.name not in EDITOR_ROLES:
             raise HTTPException(status_code=403, detail="Only Editors can approve or publish")
-            
-    article.status = status
-    if status == models.ArticleStatus.PUBLISHED and not article.published_at:
-        article.published_at = datetime.utcnow()
-        
+
+    # One UPDATE ... RETURNING instead of SELECT, mutate, commit and refresh
+    values = {"status": status}
+    if status == models.ArticleStatus.PUBLISHED:
+        values["published_at"] = func.coalesce(models.Article.published_at, utcnow())
+    stmt = _scope_to_author(update(models.Article).where(models.Article.id == article_id), current_user)
+    stmt = stmt.values(**values).returning(models.Article).options(*ARTICLE_LOAD_OPTIONS)
+    article = db.execute(stmt).scalar_one_or_none()
+    if not article:
+        raise _article_not_editable(db, article_id)
+
     db.commit()
-    db.refresh(article)
+    _invalidate_article_cache(article.slug)
     return article
 
 @router.post("/{article_id}/reviews", response_model=schemas.ArticleReview)
@@ -163,4 +244,5 @@ def add_review(
     db.add(new_review)
     db.commit()
     db.refresh(new_review)
+    _invalidate_article_cache(article.slug)
     return new_review
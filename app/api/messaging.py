@@ -1,21 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, case, delete, exists, func, insert, or_, select
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 from app import models, database
 from app.auth import get_current_user
+from app.database import get_db
+from app.cache import TTLCache
+from app.responses import ORJSONResponse
 
 router = APIRouter()
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ========== Pydantic Schemas ==========
 
 class ChannelCreate(BaseModel):
@@ -107,9 +103,20 @@ class NotificationPrefs(BaseModel):
 
 # ========== Helper Functions ==========
 
+# Hot polling endpoints; entries are dropped on the writes handled by this worker
+_status_cache = TTLCache(maxsize=4096, ttl=15)   # user_id -> status; per worker, so keep it short
+_unread_cache = TTLCache(maxsize=4096, ttl=10)   # user_id -> {"total", "channels"}
+
+# Everything MessageOut reads off a message, loaded in a fixed number of queries
+MESSAGE_LOAD_OPTIONS = (
+    joinedload(models.ChannelMessage.user),
+    selectinload(models.ChannelMessage.reactions),
+    selectinload(models.ChannelMessage.attachments),
+)
+
 def check_can_create_channel(user: models.User, db: Session):
     """Check if user has permission to create channels"""
-    if user.role.name in ["admin", "engineer"]:
+    if user.is_staff:
         return True
     # Check if user has 'create_channels' permission
     if user.role.permissions and "create_channels" in user.role.permissions:
@@ -122,13 +129,93 @@ def get_user_membership(channel_id: int, user_id: int, db: Session):
         models.ChannelMember.user_id == user_id
     ).first()
 
+# The ChatChannel columns ChannelOut needs (no entity hydration for list queries)
+CHANNEL_OUT_COLUMNS = (
+    models.ChatChannel.id, models.ChatChannel.name, models.ChatChannel.slug,
+    models.ChatChannel.description, models.ChatChannel.channel_type, models.ChatChannel.created_by,
+    models.ChatChannel.created_at, models.ChatChannel.is_archived,
+)
+
+def channel_dict(channel, unread_count: int = 0, last_message: Optional[str] = None) -> dict:
+    """
+    ChannelOut fields as a plain dict, for handlers that bypass response_model.
+    `channel` is a ChatChannel or a row selected with CHANNEL_OUT_COLUMNS.
+    """
+    return {
+        "id": channel.id,
+        "name": channel.name,
+        "slug": channel.slug,
+        "description": channel.description,
+        "channel_type": channel.channel_type,
+        "created_by": channel.created_by,
+        "created_at": channel.created_at,
+        "is_archived": channel.is_archived,
+        "unread_count": unread_count,
+        "last_message": last_message
+    }
+
+def message_dict(m: models.ChannelMessage) -> dict:
+    """MessageOut fields as a plain dict; expects MESSAGE_LOAD_OPTIONS to have been applied."""
+    return {
+        "id": m.id,
+        "channel_id": m.channel_id,
+        "user_id": m.user_id,
+        "username": m.user.username if m.user else "System",
+        "content": m.content,
+        "timestamp": m.timestamp,
+        "edited_at": m.edited_at,
+        "is_system_message": m.is_system_message,
+        "reply_to_id": m.reply_to_id,
+        "reactions": [
+            {"id": r.id, "user_id": r.user_id, "emoji": r.emoji}
+            for r in m.reactions
+        ],
+        "attachments": [
+            {"id": a.id, "file_url": a.file_url, "file_type": a.file_type, "file_name": a.file_name, "file_size": a.file_size}
+            for a in m.attachments
+        ]
+    }
+
+def unread_count_subquery(user_id: int):
+    """
+    Correlated COUNT of messages from other users in `ChannelMember.channel_id` newer
+    than that membership's `last_read_at` (all of them if never read).
+    Use it in a statement that selects from or joins ChannelMember.
+    """
+    return (
+        select(func.count(models.ChannelMessage.id))
+        .where(
+            models.ChannelMessage.channel_id == models.ChannelMember.channel_id,
+            models.ChannelMessage.user_id != user_id,
+            or_(
+                models.ChannelMember.last_read_at.is_(None),
+                models.ChannelMessage.timestamp > models.ChannelMember.last_read_at
+            )
+        )
+        .correlate(models.ChannelMember)
+        .scalar_subquery()
+    )
+
+def is_member(channel_id: int, user_id: int, db: Session) -> bool:
+    """Membership test without loading the ChannelMember row."""
+    member = db.query(models.ChannelMember.id).filter(
+        models.ChannelMember.channel_id == channel_id,
+        models.ChannelMember.user_id == user_id
+    ).exists()
+    return db.query(member).scalar()
+
 def get_or_create_dm_channel(user1_id: int, user2_id: int, db: Session):
     """Get or create a DM channel between two users"""
-    # Find existing DM channel
-    existing = db.query(models.ChatChannel).filter(
-        models.ChatChannel.channel_type == "direct"
-    ).join(models.ChannelMember).filter(
-        models.ChannelMember.user_id.in_([user1_id, user2_id])
+    # Find existing DM channel: direct channels both users belong to, members loaded in one go
+    def channels_of(user_id):
+        return select(models.ChannelMember.channel_id).where(models.ChannelMember.user_id == user_id)
+    
+    existing = db.query(models.ChatChannel).options(
+        selectinload(models.ChatChannel.members)
+    ).filter(
+        models.ChatChannel.channel_type == "direct",
+        models.ChatChannel.id.in_(channels_of(user1_id)),
+        models.ChatChannel.id.in_(channels_of(user2_id))
     ).all()
     
     for channel in existing:
@@ -137,11 +224,12 @@ def get_or_create_dm_channel(user1_id: int, user2_id: int, db: Session):
             return channel
     
     # Create new DM channel
-    user1 = db.query(models.User).get(user1_id)
-    user2 = db.query(models.User).get(user2_id)
+    usernames = dict(db.execute(
+        select(models.User.id, models.User.username).where(models.User.id.in_([user1_id, user2_id]))
+    ).all())
     
     channel = models.ChatChannel(
-        name=f"DM: {user1.username} & {user2.username}",
+        name=f"DM: {usernames[user1_id]} & {usernames[user2_id]}",
         slug=f"dm-{min(user1_id, user2_id)}-{max(user1_id, user2_id)}",
         channel_type="direct",
         created_by=user1_id
@@ -159,68 +247,57 @@ def get_or_create_dm_channel(user1_id: int, user2_id: int, db: Session):
 
 # ========== Channel Endpoints ==========
 
-@router.get("/channels", response_model=List[ChannelOut])
+@router.get("/channels", responses={200: {"model": List[ChannelOut]}})
 def list_my_channels(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """List all channels: public channels + channels where user is a member"""
-    # Get user's memberships
-    user_memberships = {m.channel_id: m for m in db.query(models.ChannelMember).filter(
-        models.ChannelMember.user_id == current_user.id
-    ).all()}
+    # One statement: each channel with the user's membership (if any), their unread
+    # count and the latest message, instead of two extra queries per channel
+    # Preview only: 51 characters are enough to know whether to add "..."
+    last_message = (
+        select(func.substr(models.ChannelMessage.content, 1, 51))
+        .where(models.ChannelMessage.channel_id == models.ChatChannel.id)
+        .order_by(models.ChannelMessage.timestamp.desc(), models.ChannelMessage.id.desc())
+        .limit(1)
+        .correlate(models.ChatChannel)
+        .scalar_subquery()
+    )
+    unread = case(
+        (models.ChannelMember.id.is_(None), 0),
+        else_=unread_count_subquery(current_user.id),
+    )
     
     # Get all non-archived channels that are either:
     # 1. Public (visible to everyone)
     # 2. The user is a member of (private or direct)
-    member_channel_ids = list(user_memberships.keys())
-    
-    channels = db.query(models.ChatChannel).filter(
-        models.ChatChannel.is_archived == False,
-        or_(
-            models.ChatChannel.channel_type == "public",
-            models.ChatChannel.id.in_(member_channel_ids) if member_channel_ids else False
+    rows = db.execute(
+        select(*CHANNEL_OUT_COLUMNS, unread.label("unread_count"), last_message.label("last_message"))
+        .outerjoin(models.ChannelMember, and_(
+            models.ChannelMember.channel_id == models.ChatChannel.id,
+            models.ChannelMember.user_id == current_user.id
+        ))
+        .where(
+            models.ChatChannel.is_archived == False,
+            or_(
+                models.ChatChannel.channel_type == "public",
+                models.ChannelMember.id.is_not(None)
+            )
         )
     ).all()
     
     result = []
-    for channel in channels:
-        membership = user_memberships.get(channel.id)
-        
-        # Count unread messages
-        unread = 0
+    for row in rows:
         last_msg = None
+        if row.last_message:
+            last_msg = row.last_message[:50] + "..." if len(row.last_message) > 50 else row.last_message
         
-        if membership:
-            if membership.last_read_at:
-                unread = db.query(models.ChannelMessage).filter(
-                    models.ChannelMessage.channel_id == channel.id,
-                    models.ChannelMessage.timestamp > membership.last_read_at,
-                    models.ChannelMessage.user_id != current_user.id
-                ).count()
-            else:
-                unread = db.query(models.ChannelMessage).filter(
-                    models.ChannelMessage.channel_id == channel.id,
-                    models.ChannelMessage.user_id != current_user.id
-                ).count()
-        
-        # Get last message
-        last = db.query(models.ChannelMessage).filter(
-            models.ChannelMessage.channel_id == channel.id
-        ).order_by(models.ChannelMessage.timestamp.desc()).first()
-        
-        if last:
-            last_msg = last.content[:50] + "..." if len(last.content) > 50 else last.content
-        
-        result.append({
-            **channel.__dict__,
-            "unread_count": unread,
-            "last_message": last_msg
-        })
+        result.append(channel_dict(row, row.unread_count, last_msg))
     
-    return result
+    return ORJSONResponse(result)
 
-@router.post("/channels", response_model=ChannelOut)
+@router.post("/channels", responses={200: {"model": ChannelOut}})
 def create_channel(
     channel: ChannelCreate,
     db: Session = Depends(get_db),
@@ -228,12 +305,17 @@ def create_channel(
 ):
     check_can_create_channel(current_user, db)
     
-    slug = channel.name.lower().replace(" ", "-").replace("'", "")
+    base_slug = channel.name.lower().replace(" ", "-").replace("'", "")
     
-    # Check slug uniqueness
-    existing = db.query(models.ChatChannel).filter(models.ChatChannel.slug == slug).first()
-    if existing:
-        slug = f"{slug}-{int(datetime.now().timestamp())}"
+    # Check slug uniqueness: one query for every slug sharing the prefix, suffix picked locally
+    taken = set(db.execute(
+        select(models.ChatChannel.slug).where(models.ChatChannel.slug.startswith(base_slug, autoescape=True))
+    ).scalars())
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
     
     db_channel = models.ChatChannel(
         name=channel.name,
@@ -252,14 +334,14 @@ def create_channel(
         role="owner"
     ))
     
-    # Add initial members
-    for user_id in channel.member_ids:
-        if user_id != current_user.id:
-            db.add(models.ChannelMember(
-                channel_id=db_channel.id,
-                user_id=user_id,
-                role="member"
-            ))
+    # Add initial members (one executemany INSERT)
+    member_rows = [
+        {"channel_id": db_channel.id, "user_id": user_id, "role": "member"}
+        for user_id in channel.member_ids
+        if user_id != current_user.id
+    ]
+    if member_rows:
+        db.execute(insert(models.ChannelMember), member_rows)
     
     # System message
     db.add(models.ChannelMessage(
@@ -270,9 +352,10 @@ def create_channel(
     ))
     
     db.commit()
+    _unread_cache.clear()
     db.refresh(db_channel)
     
-    return {**db_channel.__dict__, "unread_count": 0, "last_message": None}
+    return ORJSONResponse(channel_dict(db_channel))
 
 @router.get("/channels/{channel_id}")
 def get_channel(
@@ -280,7 +363,9 @@ def get_channel(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    channel = db.query(models.ChatChannel).filter(models.ChatChannel.id == channel_id).first()
+    channel = db.query(models.ChatChannel).options(
+        selectinload(models.ChatChannel.members).joinedload(models.ChannelMember.user)
+    ).filter(models.ChatChannel.id == channel_id).first()
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
@@ -299,13 +384,26 @@ def get_channel(
             "joined_at": m.joined_at
         })
     
-    return {
-        "channel": {**channel.__dict__, "unread_count": 0, "last_message": None},
+    my_membership = None
+    if membership:
+        my_membership = {
+            "id": membership.id,
+            "channel_id": membership.channel_id,
+            "user_id": membership.user_id,
+            "role": membership.role,
+            "joined_at": membership.joined_at,
+            "last_read_at": membership.last_read_at,
+            "notifications_enabled": membership.notifications_enabled,
+            "sound_enabled": membership.sound_enabled
+        }
+    
+    return ORJSONResponse({
+        "channel": channel_dict(channel),
         "members": members,
-        "my_membership": membership
-    }
+        "my_membership": my_membership
+    })
 
-@router.put("/channels/{channel_id}", response_model=ChannelOut)
+@router.put("/channels/{channel_id}", responses={200: {"model": ChannelOut}})
 def update_channel(
     channel_id: int,
     update: ChannelUpdate,
@@ -324,8 +422,9 @@ def update_channel(
         setattr(channel, key, value)
     
     db.commit()
+    _unread_cache.clear()
     db.refresh(channel)
-    return {**channel.__dict__, "unread_count": 0, "last_message": None}
+    return ORJSONResponse(channel_dict(channel))
 
 # ========== Member Endpoints ==========
 
@@ -344,22 +443,25 @@ def add_member(
     if not membership or membership.role not in ["owner", "admin"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    existing = get_user_membership(channel_id, user_id, db)
-    if existing:
+    if is_member(channel_id, user_id, db):
         raise HTTPException(status_code=400, detail="User already a member")
     
+    username = db.execute(select(models.User.username).where(models.User.id == user_id)).scalar()
+    if username is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
     db.add(models.ChannelMember(channel_id=channel_id, user_id=user_id, role="member"))
     
     # System message
-    user = db.query(models.User).get(user_id)
     db.add(models.ChannelMessage(
         channel_id=channel_id,
         user_id=current_user.id,
-        content=f"{user.username} a rejoint le salon",
+        content=f"{username} a rejoint le salon",
         is_system_message=True
     ))
     
     db.commit()
+    _unread_cache.clear()
     return {"message": "Member added"}
 
 @router.delete("/channels/{channel_id}/members/{user_id}")
@@ -383,6 +485,7 @@ def remove_member(
     
     db.delete(target)
     db.commit()
+    _unread_cache.pop(user_id)
     return {"message": "Member removed"}
 
 @router.put("/channels/{channel_id}/notifications")
@@ -403,7 +506,7 @@ def update_notification_prefs(
 
 # ========== Message Endpoints ==========
 
-@router.get("/channels/{channel_id}/messages", response_model=List[MessageOut])
+@router.get("/channels/{channel_id}/messages", responses={200: {"model": List[MessageOut]}})
 def get_messages(
     channel_id: int,
     limit: int = 50,
@@ -419,7 +522,7 @@ def get_messages(
     if not membership and channel.channel_type != "public":
         raise HTTPException(status_code=403, detail="Not a member")
     
-    query = db.query(models.ChannelMessage).filter(
+    query = db.query(models.ChannelMessage).options(*MESSAGE_LOAD_OPTIONS).filter(
         models.ChannelMessage.channel_id == channel_id
     )
     
@@ -430,28 +533,17 @@ def get_messages(
     
     # Update last_read_at
     if membership:
-        membership.last_read_at = datetime.utcnow()
+        membership.last_read_at = func.now()
         db.commit()
+        _unread_cache.pop(current_user.id)
     
     result = []
     for m in reversed(messages):
-        result.append({
-            "id": m.id,
-            "channel_id": m.channel_id,
-            "user_id": m.user_id,
-            "username": m.user.username if m.user else "System",
-            "content": m.content,
-            "timestamp": m.timestamp,
-            "edited_at": m.edited_at,
-            "is_system_message": m.is_system_message,
-            "reply_to_id": m.reply_to_id,
-            "reactions": m.reactions,
-            "attachments": m.attachments
-        })
+        result.append(message_dict(m))
     
-    return result
+    return ORJSONResponse(result)
 
-@router.post("/channels/{channel_id}/messages", response_model=MessageOut)
+@router.post("/channels/{channel_id}/messages", responses={200: {"model": MessageOut}})
 def send_message(
     channel_id: int,
     message: MessageCreate,
@@ -495,24 +587,15 @@ def send_message(
         db.add(attachment)
     
     # Update last_read_at for sender
-    membership.last_read_at = datetime.utcnow()
+    membership.last_read_at = func.now()
     
     db.commit()
-    db.refresh(db_message)
+    _unread_cache.clear()
+    db_message = db.query(models.ChannelMessage).options(*MESSAGE_LOAD_OPTIONS).populate_existing().filter(
+        models.ChannelMessage.id == db_message.id
+    ).one()
     
-    return {
-        "id": db_message.id,
-        "channel_id": db_message.channel_id,
-        "user_id": db_message.user_id,
-        "username": current_user.username,
-        "content": db_message.content,
-        "timestamp": db_message.timestamp,
-        "edited_at": db_message.edited_at,
-        "is_system_message": False,
-        "reply_to_id": db_message.reply_to_id,
-        "reactions": db_message.reactions,
-        "attachments": db_message.attachments
-    }
+    return ORJSONResponse(message_dict(db_message))
 
 # ========== DM Endpoints ==========
 
@@ -525,8 +608,7 @@ def start_dm(
     if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot DM yourself")
     
-    target_user = db.query(models.User).get(user_id)
-    if not target_user:
+    if not db.query(exists().where(models.User.id == user_id)).scalar():
         raise HTTPException(status_code=404, detail="User not found")
     
     channel = get_or_create_dm_channel(current_user.id, user_id, db)
@@ -539,37 +621,38 @@ def get_unread_counts(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    memberships = db.query(models.ChannelMember).filter(
-        models.ChannelMember.user_id == current_user.id
+    cached = _unread_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+    
+    # Unread messages per non-archived channel the user belongs to, in one GROUP BY
+    rows = db.execute(
+        select(models.ChannelMessage.channel_id, func.count(models.ChannelMessage.id))
+        .join(models.ChannelMember, and_(
+            models.ChannelMember.channel_id == models.ChannelMessage.channel_id,
+            models.ChannelMember.user_id == current_user.id
+        ))
+        .join(models.ChatChannel, models.ChatChannel.id == models.ChannelMessage.channel_id)
+        .where(
+            models.ChatChannel.is_archived == False,
+            models.ChannelMessage.user_id != current_user.id,
+            or_(
+                models.ChannelMember.last_read_at.is_(None),
+                models.ChannelMessage.timestamp > models.ChannelMember.last_read_at
+            )
+        )
+        .group_by(models.ChannelMessage.channel_id)
     ).all()
     
-    total_unread = 0
-    channels = {}
-    
-    for membership in memberships:
-        if membership.channel.is_archived:
-            continue
-            
-        if membership.last_read_at:
-            unread = db.query(models.ChannelMessage).filter(
-                models.ChannelMessage.channel_id == membership.channel_id,
-                models.ChannelMessage.timestamp > membership.last_read_at,
-                models.ChannelMessage.user_id != current_user.id
-            ).count()
-        else:
-            unread = db.query(models.ChannelMessage).filter(
-                models.ChannelMessage.channel_id == membership.channel_id,
-                models.ChannelMessage.user_id != current_user.id
-            ).count()
-        
-        if unread > 0:
-            channels[membership.channel_id] = unread
-            total_unread += unread
+    channels = {channel_id: unread for channel_id, unread in rows}
+    total_unread = sum(channels.values())
     
-    return {
+    result = {
         "total": total_unread,
         "channels": channels
     }
+    _unread_cache.set(current_user.id, result)
+    return result
 
 # ========== Reaction & Status Endpoints ==========
 
@@ -580,32 +663,29 @@ def add_reaction(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    message = db.query(models.ChannelMessage).get(message_id)
+    message = db.get(models.ChannelMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
     # Check if user is in channel
-    membership = get_user_membership(message.channel_id, current_user.id, db)
-    if not membership and message.channel.channel_type != "public":
+    if message.channel.channel_type != "public" and not is_member(message.channel_id, current_user.id, db):
         raise HTTPException(status_code=403, detail="Not in channel")
     
-    # Check if exists
-    existing = db.query(models.MessageReaction).filter(
-        models.MessageReaction.message_id == message_id,
-        models.MessageReaction.user_id == current_user.id,
-        models.MessageReaction.emoji == emoji
-    ).first()
-    
-    if existing:
-        db.delete(existing)
-        action = "removed"
-    else:
-        db.add(models.MessageReaction(
-            message_id=message_id,
-            user_id=current_user.id,
-            emoji=emoji
+    # Toggle: insert unless the unique (message, user, emoji) row exists, else delete it
+    # (the index comes from revision 0005 on databases that predate it)
+    added = db.execute(
+        database.dialect_insert(models.MessageReaction)
+        .values(message_id=message_id, user_id=current_user.id, emoji=emoji)
+        .on_conflict_do_nothing(index_elements=["message_id", "user_id", "emoji"])
+        .returning(models.MessageReaction.id)
+    ).scalar() is not None
+    if not added:
+        db.execute(delete(models.MessageReaction).where(
+            models.MessageReaction.message_id == message_id,
+            models.MessageReaction.user_id == current_user.id,
+            models.MessageReaction.emoji == emoji
         ))
-        action = "added"
+    action = "added" if added else "removed"
     
     db.commit()
     return {"status": action}
@@ -618,6 +698,7 @@ def update_status(
 ):
     current_user.status = status_update.status
     db.commit()
+    _status_cache.set(current_user.id, current_user.status)
     return {"status": current_user.status}
 
 @router.get("/users/status/{user_id}")
@@ -626,10 +707,14 @@ def get_user_status(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    user = db.query(models.User).get(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return {"status": user.status}
+    status = _status_cache.get(user_id)
+    if status is None:
+        row = db.execute(select(models.User.status).where(models.User.id == user_id)).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        status = row.status
+        _status_cache.set(user_id, status)
+    return {"status": status}
 
 # ========== Delete Endpoints ==========
 
@@ -640,17 +725,18 @@ def delete_message(
     current_user: models.User = Depends(get_current_user)
 ):
     """Delete a message (only own message or admin)"""
-    message = db.query(models.ChannelMessage).get(message_id)
+    message = db.get(models.ChannelMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
     # Check permissions: own message or admin
-    is_admin = current_user.role and current_user.role.name in ['admin', 'engineer']
+    is_admin = current_user.is_staff
     if message.user_id != current_user.id and not is_admin:
         raise HTTPException(status_code=403, detail="Not authorized to delete this message")
     
     db.delete(message)
     db.commit()
+    _unread_cache.clear()
     return {"status": "deleted", "message_id": message_id}
 
 @router.delete("/channels/{channel_id}")
@@ -660,24 +746,25 @@ def delete_channel(
     current_user: models.User = Depends(get_current_user)
 ):
     """Delete a channel (admin only or channel owner)"""
-    channel = db.query(models.ChatChannel).get(channel_id)
+    channel = db.get(models.ChatChannel, channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
     # Check permissions
-    is_admin = current_user.role and current_user.role.name in ['admin', 'engineer']
+    is_admin = current_user.is_staff
     is_owner = channel.created_by == current_user.id
     
     if not is_admin and not is_owner:
         raise HTTPException(status_code=403, detail="Not authorized to delete this channel")
     
     # Delete all messages first
-    db.query(models.ChannelMessage).filter(models.ChannelMessage.channel_id == channel_id).delete()
+    db.query(models.ChannelMessage).filter(models.ChannelMessage.channel_id == channel_id).delete(synchronize_session=False)
     # Delete all members
-    db.query(models.ChannelMember).filter(models.ChannelMember.channel_id == channel_id).delete()
+    db.query(models.ChannelMember).filter(models.ChannelMember.channel_id == channel_id).delete(synchronize_session=False)
     # Delete channel
     db.delete(channel)
     db.commit()
+    _unread_cache.clear()
     return {"status": "deleted", "channel_id": channel_id}
 
 @router.put("/channels/{channel_id}/messages/{message_id}/read")
@@ -688,7 +775,7 @@ def mark_message_read(
     current_user: models.User = Depends(get_current_user)
 ):
     """Mark up to this message as read"""
-    message = db.query(models.ChannelMessage).get(message_id)
+    message = db.get(models.ChannelMessage, message_id)
     if not message or message.channel_id != channel_id:
         raise HTTPException(status_code=404, detail="Message not found")
     
@@ -700,5 +787,6 @@ def mark_message_read(
     if membership:
         membership.last_read_at = message.timestamp
         db.commit()
+        _unread_cache.pop(current_user.id)
     
     return {"status": "marked_read"}
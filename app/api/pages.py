@@ -2,16 +2,17 @@
 Builder Pages API - CRUD for App Builder pages.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-import json
 import re
 
 from ..database import get_db
 from ..models.builder_page import BuilderPage
-from ..models.base_models import ActivityLog
+from ..responses import ORJSONResponse
+from ..services.activity_log import write_activity_log
 
 
 router = APIRouter(prefix="/pages", tags=["pages"])
@@ -49,11 +50,15 @@ class PageUpdate(BaseModel):
     is_published: Optional[bool] = None
 
 
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_SPACE = re.compile(r'[\s_-]+')
+
+
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug."""
     text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
+    text = _SLUG_STRIP.sub('', text)
+    text = _SLUG_SPACE.sub('-', text)
     return text
 
 
@@ -62,29 +67,27 @@ def slugify(text: str) -> str:
 @router.get("")
 def list_pages(db: Session = Depends(get_db)):
     """List all saved pages."""
-    pages = db.query(BuilderPage).order_by(BuilderPage.updated_at.desc()).all()
-    return [
-        {
-            "id": p.id,
-            "name": p.name,
-            "slug": p.slug,
-            "description": p.description,
-            "is_published": p.is_published,
-            "created_at": p.created_at.isoformat() if p.created_at else None,
-            "updated_at": p.updated_at.isoformat() if p.updated_at else None
-        }
-        for p in pages
-    ]
+    # Listing columns only: widgets/theme JSON can be large and are not part of the list
+    rows = db.execute(
+        select(
+            BuilderPage.id, BuilderPage.name, BuilderPage.slug, BuilderPage.description,
+            BuilderPage.is_published, BuilderPage.created_at, BuilderPage.updated_at
+        ).order_by(BuilderPage.updated_at.desc())
+    ).all()
+    return ORJSONResponse([dict(row._mapping) for row in rows])
 
 
 @router.post("")
-def create_page(page: PageCreate, db: Session = Depends(get_db)):
+def create_page(page: PageCreate, background: BackgroundTasks, db: Session = Depends(get_db)):
     """Create a new page."""
-    # Generate unique slug
+    # Generate unique slug: fetch every slug sharing the prefix once, pick the suffix locally
     base_slug = slugify(page.name)
+    taken = set(db.execute(
+        select(BuilderPage.slug).where(BuilderPage.slug.startswith(base_slug, autoescape=True))
+    ).scalars())
     slug = base_slug
     counter = 1
-    while db.query(BuilderPage).filter(BuilderPage.slug == slug).first():
+    while slug in taken:
         slug = f"{base_slug}-{counter}"
         counter += 1
     
@@ -92,24 +95,20 @@ def create_page(page: PageCreate, db: Session = Depends(get_db)):
         name=page.name,
         slug=slug,
         description=page.description,
-        widgets_json=json.dumps([w.model_dump() for w in page.widgets]),
-        theme_json=json.dumps(page.theme.model_dump()) if page.theme else None
+        widgets_json=[w.model_dump() for w in page.widgets],
+        theme_json=page.theme.model_dump() if page.theme else None
     )
     db.add(db_page)
     db.commit()
     db.refresh(db_page)
     
-    # Activity Log
-    try:
-        log = ActivityLog(
-            action=f"Created page '{db_page.name}'",
-            page_id=db_page.id,
-            resource_type="page"
-        )
-        db.add(log)
-        db.commit()
-    except Exception as e:
-        print(f"Failed to create activity log: {e}")
+    # Activity Log (written after the response is sent)
+    background.add_task(
+        write_activity_log,
+        action=f"Created page '{db_page.name}'",
+        page_id=db_page.id,
+        resource_type="page"
+    )
     
     return {
         "id": db_page.id,
@@ -131,8 +130,8 @@ def get_page(page_id: int, db: Session = Depends(get_db)):
         "name": page.name,
         "slug": page.slug,
         "description": page.description,
-        "widgets": json.loads(page.widgets_json or "[]"),
-        "theme": json.loads(page.theme_json) if page.theme_json else None,
+        "widgets": page.widgets_json or [],
+        "theme": page.theme_json,
         "is_published": page.is_published,
         "created_at": page.created_at.isoformat() if page.created_at else None,
         "updated_at": page.updated_at.isoformat() if page.updated_at else None
@@ -150,14 +149,14 @@ def get_page_by_slug(slug: str, db: Session = Depends(get_db)):
         "id": page.id,
         "name": page.name,
         "slug": page.slug,
-        "widgets": json.loads(page.widgets_json or "[]"),
-        "theme": json.loads(page.theme_json) if page.theme_json else None,
+        "widgets": page.widgets_json or [],
+        "theme": page.theme_json,
         "is_published": page.is_published
     }
 
 
 @router.put("/{page_id}")
-def update_page(page_id: int, update: PageUpdate, db: Session = Depends(get_db)):
+def update_page(page_id: int, update: PageUpdate, background: BackgroundTasks, db: Session = Depends(get_db)):
     """Update a page."""
     page = db.query(BuilderPage).filter(BuilderPage.id == page_id).first()
     if not page:
@@ -174,8 +173,8 @@ def update_page(page_id: int, update: PageUpdate, db: Session = Depends(get_db))
         new_slug = slugify(update.slug)
         if page.slug != new_slug:
             # Check for uniqueness
-            existing = db.query(BuilderPage).filter(BuilderPage.slug == new_slug).first()
-            if existing and existing.id != page.id:
+            taken = db.query(BuilderPage.id).filter(BuilderPage.slug == new_slug, BuilderPage.id != page.id).exists()
+            if db.query(taken).scalar():
                 raise HTTPException(status_code=400, detail="Slug already in use")
             
             changes.append(f"slug changed from '{page.slug}' to '{new_slug}'")
@@ -186,13 +185,12 @@ def update_page(page_id: int, update: PageUpdate, db: Session = Depends(get_db))
             changes.append("description updated")
         page.description = update.description
     if update.widgets is not None:
-        # Compare JSON strings for simplicity, or parse and compare dicts for more granular check
-        new_widgets_json = json.dumps([w.model_dump() for w in update.widgets])
+        new_widgets_json = [w.model_dump() for w in update.widgets]
         if page.widgets_json != new_widgets_json:
             changes.append("widgets updated")
         page.widgets_json = new_widgets_json
     if update.theme is not None:
-        new_theme_json = json.dumps(update.theme.model_dump())
+        new_theme_json = update.theme.model_dump()
         if page.theme_json != new_theme_json:
             changes.append("theme updated")
         page.theme_json = new_theme_json
@@ -204,19 +202,15 @@ def update_page(page_id: int, update: PageUpdate, db: Session = Depends(get_db))
     db.commit()
     db.refresh(page)
 
-    # Activity Log
+    # Activity Log (written after the response is sent)
     if changes:
-        try:
-            log = ActivityLog(
-                action=f"Updated page '{page.name}'",
-                details=", ".join(changes),
-                page_id=page.id,
-                resource_type="page"
-            )
-            db.add(log)
-            db.commit()
-        except Exception as e:
-            print(f"Failed to create activity log: {e}")
+        background.add_task(
+            write_activity_log,
+            action=f"Updated page '{page.name}'",
+            details=", ".join(changes),
+            page_id=page.id,
+            resource_type="page"
+        )
     
     return {"message": "Page updated successfully", "slug": page.slug}
 
@@ -1,20 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, raiseload
+import hashlib
+import orjson
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
-from app import models, database
-from app.auth import get_current_user
+from app import models
+from app.auth import require_staff
+from app.database import get_db
+from app.cache import TTLCache
+from app.responses import etag_matches
 
 router = APIRouter()
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ========== Pydantic Schemas ==========
 
 # Categories
@@ -129,31 +128,92 @@ class PlanOut(BaseModel):
     class Config:
         from_attributes = True
 
-# ========== Admin Endpoints ==========
+# ProductOut embeds the category; load it in the same query and refuse any
+# other lazy load during serialization
+PRODUCT_LOAD_OPTIONS = (joinedload(models.Product.category), raiseload("*"))
+
+# ========== Response Helpers ==========
+
+# Handlers return pre-serialized bytes, skipping response_model validation
+# and jsonable_encoder.
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+# List validators/serializers compiled once at import, so the first storefront
+# request after a cold start does not pay for building them
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryOut])
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductOut])
+PLAN_LIST_ADAPTER = TypeAdapter(List[PlanOut])
+
+def _dump_list(adapter: TypeAdapter, rows) -> bytes:
+    # One pydantic-core pass over the whole list instead of a model per row
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+# Admin lists select just the schema's columns and encode the rows as they come
+# back, skipping ORM hydration and pydantic entirely.
+def _schema_columns(model, schema):
+    return [getattr(model, name) for name in schema.model_fields if name in model.__table__.c]
+
+CATEGORY_COLUMNS = _schema_columns(models.ProductCategory, CategoryOut)
+PRODUCT_COLUMNS = _schema_columns(models.Product, ProductOut)
+PLAN_COLUMNS = _schema_columns(models.SubscriptionPlan, PlanOut)
+
+def _dump_rows(db: Session, stmt) -> bytes:
+    return orjson.dumps([dict(row) for row in db.execute(stmt).mappings()])
+
+def _dump_products_with_category(db: Session) -> bytes:
+    stmt = select(
+        *PRODUCT_COLUMNS,
+        *[column.label(f"category__{column.key}") for column in CATEGORY_COLUMNS]
+    ).outerjoin(models.Product.category)
+
+    products = []
+    for row in db.execute(stmt).mappings():
+        product = {column.key: row[column.key] for column in PRODUCT_COLUMNS}
+        category = {column.key: row[f"category__{column.key}"] for column in CATEGORY_COLUMNS}
+        product["category"] = category if category["id"] is not None else None
+        products.append(product)
+    return orjson.dumps(products)
+
+# ========== Public Cache ==========
+
+# Serialized response bodies for the anonymous storefront, one cache per
+# endpoint so catalogue data that rarely moves can live longer.
+_categories_cache = TTLCache(maxsize=1, ttl=60)  # (etag, body)
+CATEGORIES_CACHE_CONTROL = "public, max-age=30"
+_plans_cache = TTLCache(maxsize=1, ttl=60)
+_products_cache = TTLCache(maxsize=256, ttl=30)
+_product_slug_cache = TTLCache(maxsize=1024, ttl=30)
+
+def _invalidate_product_cache():
+    _products_cache.clear()
+    _product_slug_cache.clear()
 
-def check_admin(user: models.User):
-    if user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def _invalidate_category_cache():
+    # Products embed their category, so their cached bodies go stale too
+    _categories_cache.clear()
+    _invalidate_product_cache()
+
+# ========== Admin Endpoints ==========
 
 # --- Categories ---
-@router.get("/admin/categories", response_model=List[CategoryOut])
+@router.get("/admin/categories", responses={200: {"model": List[CategoryOut]}})
 def list_categories(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
-    return db.query(models.ProductCategory).all()
+    return _json_response(_dump_rows(db, select(*CATEGORY_COLUMNS)))
 
 @router.post("/admin/categories", response_model=CategoryOut)
 def create_category(
     cat: CategoryCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_cat = models.ProductCategory(**cat.model_dump())
     db.add(db_cat)
     db.commit()
+    _invalidate_category_cache()
     db.refresh(db_cat)
     return db_cat
 
@@ -162,9 +222,8 @@ def update_category(
     cat_id: int,
     cat: CategoryUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_cat = db.query(models.ProductCategory).filter(models.ProductCategory.id == cat_id).first()
     if not db_cat:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -173,6 +232,7 @@ def update_category(
         setattr(db_cat, key, value)
     
     db.commit()
+    _invalidate_category_cache()
     db.refresh(db_cat)
     return db_cat
 
@@ -180,36 +240,35 @@ def update_category(
 def delete_category(
     cat_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_cat = db.query(models.ProductCategory).filter(models.ProductCategory.id == cat_id).first()
     if not db_cat:
         raise HTTPException(status_code=404, detail="Category not found")
     
     db_cat.is_active = False
     db.commit()
+    _invalidate_category_cache()
     return {"message": "Category deactivated"}
 
 # --- Products ---
-@router.get("/admin/products", response_model=List[ProductOut])
+@router.get("/admin/products", responses={200: {"model": List[ProductOut]}})
 def list_products_admin(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
-    return db.query(models.Product).all()
+    return _json_response(_dump_products_with_category(db))
 
 @router.post("/admin/products", response_model=ProductOut)
 def create_product(
     product: ProductCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_product = models.Product(**product.model_dump())
     db.add(db_product)
     db.commit()
+    _invalidate_product_cache()
     db.refresh(db_product)
     return db_product
 
@@ -218,9 +277,8 @@ def update_product(
     product_id: int,
     product: ProductUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -229,6 +287,7 @@ def update_product(
         setattr(db_product, key, value)
     
     db.commit()
+    _invalidate_product_cache()
     db.refresh(db_product)
     return db_product
 
@@ -236,36 +295,35 @@ def update_product(
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
     db_product.is_active = False
     db.commit()
+    _invalidate_product_cache()
     return {"message": "Product deactivated"}
 
 # --- Subscription Plans ---
-@router.get("/admin/plans", response_model=List[PlanOut])
+@router.get("/admin/plans", responses={200: {"model": List[PlanOut]}})
 def list_plans_admin(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
-    return db.query(models.SubscriptionPlan).order_by(models.SubscriptionPlan.sort_order).all()
+    return _json_response(_dump_rows(db, select(*PLAN_COLUMNS).order_by(models.SubscriptionPlan.sort_order)))
 
 @router.post("/admin/plans", response_model=PlanOut)
 def create_plan(
     plan: PlanCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_plan = models.SubscriptionPlan(**plan.model_dump())
     db.add(db_plan)
     db.commit()
+    _plans_cache.clear()
     db.refresh(db_plan)
     return db_plan
 
@@ -274,9 +332,8 @@ def update_plan(
     plan_id: int,
     plan: PlanUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_plan = db.query(models.SubscriptionPlan).filter(models.SubscriptionPlan.id == plan_id).first()
     if not db_plan:
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -285,6 +342,7 @@ def update_plan(
         setattr(db_plan, key, value)
     
     db.commit()
+    _plans_cache.clear()
     db.refresh(db_plan)
     return db_plan
 
@@ -292,53 +350,78 @@ def update_plan(
 def delete_plan(
     plan_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    check_admin(current_user)
     db_plan = db.query(models.SubscriptionPlan).filter(models.SubscriptionPlan.id == plan_id).first()
     if not db_plan:
         raise HTTPException(status_code=404, detail="Plan not found")
     
     db_plan.is_active = False
     db.commit()
+    _plans_cache.clear()
     return {"message": "Plan deactivated"}
 
 # ========== Public Shop Endpoints ==========
 
-@router.get("/shop/categories", response_model=List[CategoryOut])
-def list_public_categories(db: Session = Depends(get_db)):
-    return db.query(models.ProductCategory).filter(models.ProductCategory.is_active == True).all()
+@router.get("/shop/categories", responses={200: {"model": List[CategoryOut]}})
+def list_public_categories(request: Request, db: Session = Depends(get_db)):
+    cached = _categories_cache.get("all")
+    if cached is None:
+        categories = db.query(models.ProductCategory).filter(models.ProductCategory.is_active == True).all()
+        body = _dump_list(CATEGORY_LIST_ADAPTER, categories)
+        cached = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+        _categories_cache.set("all", cached)
 
-@router.get("/shop/products", response_model=List[ProductOut])
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": CATEGORIES_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/shop/products", responses={200: {"model": List[ProductOut]}})
 def list_public_products(
     category: Optional[str] = None,
     featured: Optional[bool] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Product).filter(models.Product.is_active == True)
-    
-    if category:
-        query = query.join(models.ProductCategory).filter(models.ProductCategory.slug == category)
-    
-    if featured:
-        query = query.filter(models.Product.is_featured == True)
-    
-    return query.all()
+    key = (category, bool(featured))
+    body = _products_cache.get(key)
+    if body is None:
+        query = db.query(models.Product).options(*PRODUCT_LOAD_OPTIONS).filter(models.Product.is_active == True)
+
+        if category:
+            query = query.join(models.ProductCategory).filter(models.ProductCategory.slug == category)
 
-@router.get("/shop/products/{slug}", response_model=ProductOut)
+        if featured:
+            query = query.filter(models.Product.is_featured == True)
+
+        body = _dump_list(PRODUCT_LIST_ADAPTER, query.all())
+        _products_cache.set(key, body)
+    return _json_response(body)
+
+@router.get("/shop/products/{slug}", responses={200: {"model": ProductOut}})
 def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
-    product = db.query(models.Product).filter(
-        models.Product.slug == slug,
-        models.Product.is_active == True
-    ).first()
-    
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    return product
+    body = _product_slug_cache.get(slug)
+    if body is None:
+        product = db.query(models.Product).options(*PRODUCT_LOAD_OPTIONS).filter(
+            models.Product.slug == slug,
+            models.Product.is_active == True
+        ).first()
+
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        body = ProductOut.model_validate(product).model_dump_json().encode()
+        _product_slug_cache.set(slug, body)
+    return _json_response(body)
 
-@router.get("/shop/plans", response_model=List[PlanOut])
+@router.get("/shop/plans", responses={200: {"model": List[PlanOut]}})
 def list_public_plans(db: Session = Depends(get_db)):
-    return db.query(models.SubscriptionPlan).filter(
-        models.SubscriptionPlan.is_active == True
-    ).order_by(models.SubscriptionPlan.sort_order).all()
+    body = _plans_cache.get("all")
+    if body is None:
+        plans = db.query(models.SubscriptionPlan).filter(
+            models.SubscriptionPlan.is_active == True
+        ).order_by(models.SubscriptionPlan.sort_order).all()
+        body = _dump_list(PLAN_LIST_ADAPTER, plans)
+        _plans_cache.set("all", body)
+    return _json_response(body)
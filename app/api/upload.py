@@ -1,29 +1,109 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-import shutil
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from pydantic import BaseModel
+from functools import lru_cache
+from pathlib import PurePosixPath
+import anyio
+import mimetypes
 import os
+import shutil
 import uuid
-from typing import List
+from typing import List, Optional
+from app import models
+from app.auth import get_current_user
 
 router = APIRouter()
 
+# Image types accepted by upload-image and presigned uploads
+IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".webp", ".gif"})
+
 UPLOAD_DIR = "static/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Copy uploads in 1 MiB chunks so large files never sit in memory at once
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _copy_to_path(source, path: str) -> int:
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, UPLOAD_CHUNK_SIZE)
+        return buffer.tell()
+
+async def save_upload_file(file: UploadFile, path: str) -> int:
+    """
+    Copy an upload to `path` chunk by chunk and return its size in bytes.
+    The whole copy runs in one worker thread: a single hop off the event loop
+    instead of one per chunk read and one per chunk write.
+    """
+    await file.seek(0)
+    return await anyio.to_thread.run_sync(_copy_to_path, file.file, path)
+
+# Direct-to-bucket uploads (S3 or R2). Credentials come from the usual AWS_* env vars.
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # non-AWS endpoints; must support POST policies (R2 does not)
+S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL", "").rstrip("/")  # CDN base for reads
+PRESIGN_EXPIRES = 300
+# Enforced by the bucket through the POST policy
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+class PresignRequest(BaseModel):
+    filename: str
+    content_type: Optional[str] = None
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    # Imported on first use: a required dependency, but slow to load and only
+    # direct uploads need it
+    import boto3
+    return boto3.client("s3", endpoint_url=S3_ENDPOINT_URL)
+
+@router.post("/upload/presign")
+def presign_upload(request: PresignRequest, current_user: models.User = Depends(get_current_user)):
+    """
+    Return a short-lived form the client POSTs the file to directly, so file bytes
+    never pass through this process. POST /upload remains for local setups.
+
+    A presigned PUT cannot bound the object size; the POST policy pins the key,
+    the content type and a size range, and the bucket rejects anything else.
+    """
+    if not S3_BUCKET:
+        raise HTTPException(status_code=501, detail="Direct uploads are not configured")
+
+    suffix = PurePosixPath(request.filename).suffix.lower()
+    content_type = request.content_type or mimetypes.guess_type(f"file{suffix}")[0] or ""
+    if suffix not in IMAGE_SUFFIXES or not content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
+
+    key = f"uploads/{uuid.uuid4().hex}{suffix}"
+    post = get_s3_client().generate_presigned_post(
+        S3_BUCKET,
+        key,
+        Fields={"Content-Type": content_type},
+        Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, MAX_UPLOAD_BYTES]],
+        ExpiresIn=PRESIGN_EXPIRES,
+    )
+    return {
+        # multipart/form-data POST: every field below, then the file as "file"
+        "upload_url": post["url"],
+        "fields": post["fields"],
+        "key": key,
+        "url": f"{S3_PUBLIC_URL}/{key}" if S3_PUBLIC_URL else None,
+        "expires_in": PRESIGN_EXPIRES,
+        "max_size": MAX_UPLOAD_BYTES,
+    }
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     try:
         file_extension = os.path.splitext(file.filename)[1]
-        file_name = f"{uuid.uuid4()}{file_extension}"
+        file_name = f"{uuid.uuid4().hex}{file_extension}"
         file_path = os.path.join(UPLOAD_DIR, file_name)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
+
+        size = await save_upload_file(file, file_path)
+
         return {
             "url": f"/static/uploads/{file_name}",
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": os.path.getsize(file_path)
+            "size": size
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app import models, schemas, database
 from app.auth import get_current_user, get_password_hash, verify_password
@@ -12,26 +14,34 @@ def update_profile(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Check if username/email is taken by another user
+    # Check if username/email is taken by another user, both in one query
+    taken = []
     if user_update.username:
-        existing_user = db.query(models.User).filter(
-            models.User.username == user_update.username,
-            models.User.id != current_user.id
-        ).first()
-        if existing_user:
+        taken.append(models.User.username == user_update.username)
+    if user_update.email:
+        taken.append(models.User.email == user_update.email)
+
+    if taken:
+        conflicts = db.query(models.User.username, models.User.email).filter(
+            models.User.id != current_user.id,
+            or_(*taken)
+        ).all()
+        if user_update.username and any(row.username == user_update.username for row in conflicts):
             raise HTTPException(status_code=400, detail="Username already exists")
-        current_user.username = user_update.username
+        if user_update.email and any(row.email == user_update.email for row in conflicts):
+            raise HTTPException(status_code=400, detail="Email already exists")
 
+    if user_update.username:
+        current_user.username = user_update.username
     if user_update.email:
-        existing_email = db.query(models.User).filter(
-            models.User.email == user_update.email,
-            models.User.id != current_user.id
-        ).first()
-        if existing_email:
-            raise HTTPException(status_code=400, detail="Email already exists")
         current_user.email = user_update.email
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent update; the unique indexes have the final say
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already exists")
     db.refresh(current_user)
     return current_user
 
@@ -41,12 +51,13 @@ def change_password(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    if not verify_password(password_data.old_password, current_user.hashed_password):
-        raise HTTPException(status_code=400, detail="Incorrect old password")
-
+    # Cheap check first: a typo in the confirmation should not cost a hash verification
     if password_data.new_password != password_data.confirm_password:
         raise HTTPException(status_code=400, detail="New passwords do not match")
 
+    if not verify_password(password_data.old_password, current_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect old password")
+
     current_user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
     
@@ -2,13 +2,18 @@
 Workflow API - CRUD operations and execution endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, update as sql_update
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from pydantic import BaseModel
-import json
+from pydantic import BaseModel, Field, TypeAdapter
+from datetime import datetime
+import orjson
 
 from ..database import get_db
+from ..pagination import MAX_PAGE_SIZE, Page, stream_page
+from ..responses import ORJSONResponse
 from ..models.workflow import Workflow, WorkflowExecution
 from ..services.action_registry import action_registry
 from ..services.workflow_executor import WorkflowExecutor
@@ -67,9 +72,24 @@ class WorkflowResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Dump already-validated request graphs to plain JSON-ready lists in one
+# pydantic-core call, without re-validating them
+NODES_ADAPTER = TypeAdapter(List[WorkflowNode])
+EDGES_ADAPTER = TypeAdapter(List[WorkflowEdge])
+
 class WorkflowExecuteRequest(BaseModel):
     input_data: Optional[dict] = {}
 
+class ExecutionListItem(BaseModel):
+    id: int
+    status: str
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    error: Optional[str] = Field(None, validation_alias="error_message")
+
+    class Config:
+        from_attributes = True
+
 class ExecutionResponse(BaseModel):
     id: int
     workflow_id: int
@@ -77,6 +97,7 @@ class ExecutionResponse(BaseModel):
     input_data: Optional[dict]
     output_data: Optional[dict]
     execution_log: List[dict]
+    current_node_id: Optional[str]
     error_message: Optional[str]
     started_at: str
     completed_at: Optional[str]
@@ -99,18 +120,15 @@ def list_all_actions():
 @router.get("")
 def list_workflows(db: Session = Depends(get_db)):
     """List all workflows."""
-    workflows = db.query(Workflow).all()
-    return [
-        {
-            "id": w.id,
-            "name": w.name,
-            "description": w.description,
-            "trigger_type": w.trigger_type,
-            "is_active": w.is_active,
-            "created_at": w.created_at.isoformat() if w.created_at else None
-        }
-        for w in workflows
-    ]
+    workflows = db.query(
+        Workflow.id,
+        Workflow.name,
+        Workflow.description,
+        Workflow.trigger_type,
+        Workflow.is_active,
+        Workflow.created_at,
+    ).all()
+    return ORJSONResponse([w._asdict() for w in workflows])
 
 
 @router.post("")
@@ -120,9 +138,9 @@ def create_workflow(workflow: WorkflowCreate, db: Session = Depends(get_db)):
         name=workflow.name,
         description=workflow.description,
         trigger_type=workflow.trigger_type,
-        trigger_config=json.dumps(workflow.trigger_config) if workflow.trigger_config else None,
-        nodes_json=json.dumps([n.model_dump() for n in workflow.nodes]),
-        edges_json=json.dumps([e.model_dump() for e in workflow.edges])
+        trigger_config=orjson.dumps(workflow.trigger_config).decode() if workflow.trigger_config else None,
+        nodes_json=NODES_ADAPTER.dump_python(workflow.nodes, mode="json"),
+        edges_json=EDGES_ADAPTER.dump_python(workflow.edges, mode="json")
     )
     db.add(db_workflow)
     db.commit()
@@ -142,45 +160,51 @@ def get_workflow(workflow_id: int, db: Session = Depends(get_db)):
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    return {
+    return ORJSONResponse({
         "id": workflow.id,
         "name": workflow.name,
         "description": workflow.description,
         "trigger_type": workflow.trigger_type,
-        "trigger_config": json.loads(workflow.trigger_config) if workflow.trigger_config else None,
-        "nodes": json.loads(workflow.nodes_json or "[]"),
-        "edges": json.loads(workflow.edges_json or "[]"),
+        "trigger_config": orjson.loads(workflow.trigger_config) if workflow.trigger_config else None,
+        "nodes": workflow.nodes_json or [],
+        "edges": workflow.edges_json or [],
         "is_active": workflow.is_active,
-        "created_at": workflow.created_at.isoformat() if workflow.created_at else None,
-        "updated_at": workflow.updated_at.isoformat() if workflow.updated_at else None
-    }
+        "created_at": workflow.created_at,
+        "updated_at": workflow.updated_at
+    })
 
 
 @router.put("/{workflow_id}")
 def update_workflow(workflow_id: int, update: WorkflowUpdate, db: Session = Depends(get_db)):
     """Update a workflow."""
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
+    values = {}
     if update.name is not None:
-        workflow.name = update.name
+        values["name"] = update.name
     if update.description is not None:
-        workflow.description = update.description
+        values["description"] = update.description
     if update.trigger_type is not None:
-        workflow.trigger_type = update.trigger_type
+        values["trigger_type"] = update.trigger_type
     if update.trigger_config is not None:
-        workflow.trigger_config = json.dumps(update.trigger_config)
+        values["trigger_config"] = orjson.dumps(update.trigger_config).decode()
     if update.nodes is not None:
-        workflow.nodes_json = json.dumps([n.model_dump() for n in update.nodes])
+        values["nodes_json"] = NODES_ADAPTER.dump_python(update.nodes, mode="json")
     if update.edges is not None:
-        workflow.edges_json = json.dumps([e.model_dump() for e in update.edges])
+        values["edges_json"] = EDGES_ADAPTER.dump_python(update.edges, mode="json")
     if update.is_active is not None:
-        workflow.is_active = update.is_active
-    
+        values["is_active"] = update.is_active
+
+    # One UPDATE statement; its row count doubles as the existence check
+    if values:
+        found = db.execute(
+            sql_update(Workflow).where(Workflow.id == workflow_id).values(**values)
+        ).rowcount
+    else:
+        found = db.query(exists().where(Workflow.id == workflow_id)).scalar()
+    if not found:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
     db.commit()
-    db.refresh(workflow)
-    
+
     return {"message": "Workflow updated successfully"}
 
 
@@ -204,7 +228,8 @@ async def execute_workflow(
     db: Session = Depends(get_db)
 ):
     """Execute a workflow."""
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    # Async because actions await I/O; database calls go through the threadpool
+    workflow = await run_in_threadpool(db.get, Workflow, workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
@@ -214,52 +239,52 @@ async def execute_workflow(
     executor = WorkflowExecutor(db)
     execution = await executor.execute(workflow, request.input_data)
     
-    return {
+    return ORJSONResponse({
         "execution_id": execution.id,
         "status": execution.status,
-        "output": json.loads(execution.output_data) if execution.output_data else None,
+        "output": orjson.loads(execution.output_data) if execution.output_data else None,
         "error": execution.error_message,
-        "log": json.loads(execution.execution_log or "[]")
-    }
+        "log": orjson.loads(execution.execution_log or "[]")
+    })
 
 
-@router.get("/{workflow_id}/executions")
-def list_executions(workflow_id: int, limit: int = 20, db: Session = Depends(get_db)):
-    """List recent executions for a workflow."""
-    executions = db.query(WorkflowExecution)\
-        .filter(WorkflowExecution.workflow_id == workflow_id)\
-        .order_by(WorkflowExecution.started_at.desc())\
-        .limit(limit)\
-        .all()
-    
-    return [
-        {
-            "id": e.id,
-            "status": e.status,
-            "started_at": e.started_at.isoformat() if e.started_at else None,
-            "completed_at": e.completed_at.isoformat() if e.completed_at else None,
-            "error": e.error_message
-        }
-        for e in executions
-    ]
-
-
-@router.get("/executions/{execution_id}")
+@router.get("/{workflow_id}/executions", response_model=Page[ExecutionListItem])
+def list_executions(
+    workflow_id: int,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List recent executions for a workflow, newest first.
+    Pass `next_cursor` back as `cursor` to fetch the following page.
+    """
+    query = db.query(
+        WorkflowExecution.id,
+        WorkflowExecution.status,
+        WorkflowExecution.started_at,
+        WorkflowExecution.completed_at,
+        WorkflowExecution.error_message,
+    ).filter(WorkflowExecution.workflow_id == workflow_id)
+    return stream_page(query, WorkflowExecution.started_at, WorkflowExecution.id, limit, ExecutionListItem, cursor=cursor)
+
+
+@router.get("/executions/{execution_id}", responses={200: {"model": ExecutionResponse}})
 def get_execution(execution_id: int, db: Session = Depends(get_db)):
     """Get details of a specific execution."""
     execution = db.query(WorkflowExecution).filter(WorkflowExecution.id == execution_id).first()
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
     
-    return {
+    return ORJSONResponse({
         "id": execution.id,
         "workflow_id": execution.workflow_id,
         "status": execution.status,
-        "input_data": json.loads(execution.input_data) if execution.input_data else None,
-        "output_data": json.loads(execution.output_data) if execution.output_data else None,
-        "execution_log": json.loads(execution.execution_log or "[]"),
+        "input_data": orjson.loads(execution.input_data) if execution.input_data else None,
+        "output_data": orjson.loads(execution.output_data) if execution.output_data else None,
+        "execution_log": orjson.loads(execution.execution_log or "[]"),
         "current_node_id": execution.current_node_id,
         "error_message": execution.error_message,
-        "started_at": execution.started_at.isoformat() if execution.started_at else None,
-        "completed_at": execution.completed_at.isoformat() if execution.completed_at else None
-    }
+        "started_at": execution.started_at,
+        "completed_at": execution.completed_at
+    })
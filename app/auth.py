@@ -8,11 +8,23 @@ SECRET_KEY = "your-secret-key-super-secret"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Built once and shared by every decode. Our tokens always carry sub and exp,
+# and no audience is issued, so there is nothing to check there.
+_DECODE_ALGORITHMS = [ALGORITHM]
+_DECODE_OPTIONS = {"verify_aud": False, "require_sub": True, "require_exp": True}
+
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """
+    Verify a password and, if its hash uses a deprecated scheme (bcrypt) or
+    outdated parameters, also return a fresh argon2 hash to store; else None.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
@@ -29,27 +41,56 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 # --- Dependencies ---
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from .cache import TTLCache
 from .database import get_db
 from . import models, schemas
+import hashlib
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Roles allowed into user/role management and the shop admin
+STAFF_ROLES = frozenset({"admin", "engineer"})
+
+# Verified tokens by hash -> (user id, username, exp). A hit skips the signature
+# check and turns the user lookup into a primary-key get.
+_token_cache = TTLCache(maxsize=10_000, ttl=30)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    token_key = hashlib.sha256(token.encode()).hexdigest()[:32]
+    cached = _token_cache.get(token_key)
+    if cached is not None and cached[2] > time.time():
+        user_id, username, _ = cached
+        user = db.get(models.User, user_id, options=[joinedload(models.User.role)])
+        # Renamed or deleted since the token was issued: same 401 as a fresh decode
+        if user is None or user.username != username:
+            _token_cache.pop(token_key)
             raise credentials_exception
-        token_data = schemas.TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    user = db.query(models.User).filter(models.User.username == token_data.username).first()
-    if user is None:
-        raise credentials_exception
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=_DECODE_ALGORITHMS, options=_DECODE_OPTIONS)
+            username: str = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+            token_data = schemas.TokenData(username=username)
+        except JWTError:
+            raise credentials_exception
+        # Handlers check current_user.role on almost every request: load it in the same query
+        user = db.query(models.User).options(joinedload(models.User.role)).filter(models.User.username == token_data.username).first()
+        if user is None:
+            raise credentials_exception
+        _token_cache.set(token_key, (user.id, user.username, payload.get("exp", 0)))
+    # Resolved once per request so permission checks are a plain attribute read
+    user.is_staff = user.role is not None and user.role.name in STAFF_ROLES
     return user
+
+def require_staff(current_user: models.User = Depends(get_current_user)):
+    if not current_user.is_staff:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return current_user
@@ -1,32 +1,149 @@
 import os
-from sqlalchemy import create_engine
+import anyio
+import orjson
+from fastapi import Request
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions
+from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+# JSON/JSONB columns are encoded and decoded with orjson
+JSON_CODEC = {
+    "json_serializer": lambda obj: orjson.dumps(obj).decode(),
+    "json_deserializer": orjson.loads,
+}
 
 # Support both SQLite (local) and PostgreSQL (production)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection budget for PostgreSQL. Sync handlers run in the threadpool, so
+# main.py sizes it to match: one worker thread per connection the pool can hand out.
+POOL_SIZE = 20
+MAX_OVERFLOW = 40
+
 if DATABASE_URL:
     # PostgreSQL from Fly.io
     # Fix for Fly.io PostgreSQL URL format
     if DATABASE_URL.startswith("postgres://"):
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+    # Name the driver we ship (psycopg2-binary): newer SQLAlchemy releases default
+    # plain postgresql:// URLs to psycopg 3
+    if DATABASE_URL.startswith("postgresql://"):
+        DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
     
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        # Keep warm connections for the many short chat/list requests; drop dead or
+        # server-recycled ones before use
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        # Reuse the most recently returned connection so idle extras can time out
+        # server-side instead of being cycled warm
+        pool_use_lifo=True,
+        # Bound runaway queries (milliseconds); alembic/env.py lifts it for migrations
+        connect_args={"options": "-c statement_timeout=5000"},
+        **JSON_CODEC
+    )
 else:
     # SQLite for local development
     SQLALCHEMY_DATABASE_URL = "sqlite:///./platform.db"
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, **JSON_CODEC
     )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: handlers return rows they just committed without a re-SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time from the database clock, as a naive timestamp like the
+    datetime.utcnow() values already stored.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # Same text layout SQLAlchemy writes for DateTime, so string comparisons
+    # (keyset cursors) stay consistent with Python-written rows
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(functions.now, "sqlite")
+def _now_sqlite(element, compiler, **kw):
+    # func.now() server defaults on SQLite: CURRENT_TIMESTAMP has no fractional
+    # part, which sorts wrongly against the cursor values SQLAlchemy binds
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
+def dialect_insert(table):
+    """`insert()` for the active backend, so `on_conflict_*` clauses are available."""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+class DBSessionMiddleware:
+    """
+    Opens one session per HTTP request and closes it once the response is fully sent.
+
+    Unlike a generator dependency, teardown does not need a threadpool slot (which
+    deadlocks once every thread waits on a pooled connection), and the session
+    stays usable for streamed bodies and background tasks.
+
+    The session lives on the request scope rather than in a `scoped_session`:
+    sync handlers run on arbitrary threadpool threads while this middleware runs
+    on the event loop thread, so a thread-local registry would hand the handler
+    a different session than the one closed here. Creating the session is cheap;
+    no connection is checked out until the first query.
+
+    Closing a session that still holds a transaction (any request that read but
+    did not commit) rolls it back: a blocking round-trip on PostgreSQL. That close
+    runs in a worker thread under its own limiter, so it neither stalls the event
+    loop nor queues behind handlers waiting on the pool. Sessions with nothing
+    open close inline; the extra thread hop would cost more than the close.
+    """
+
+    # Separate from the handler threadpool: handlers can be waiting on exactly the
+    # connections these closes return
+    close_limiter = anyio.CapacityLimiter(8)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        db = SessionLocal()
+        scope.setdefault("state", {})["db"] = db
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if db.in_transaction():
+                await anyio.to_thread.run_sync(db.close, limiter=self.close_limiter)
+            else:
+                db.close()
+
+
+async def get_db(request: Request) -> Session:
+    return request.state.db
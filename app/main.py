@@ -1,30 +1,91 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.services.docx_parser import parse_docx
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.sql import func
 from app import models, schemas, database
+from app.database import get_db
+from app.cache import TTLCache
+from app.pagination import MAX_PAGE_SIZE, Page, paginate
+from app.responses import ORJSONResponse, etag_matches
+from app.seed import seed_data
 from app.api.workflows import router as workflows_router
 from app.api.pages import router as pages_router
 from app.api.activity import router as activity_router
 from app.api.articles import router as articles_router
 from app.api.shop import router as shop_router
 from app.api.messaging import router as messaging_router
-from app.api.upload import router as upload_router
+from app.api.upload import router as upload_router, IMAGE_SUFFIXES, save_upload_file
 from app.api.users import router as users_router
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from contextlib import asynccontextmanager
+from pathlib import PurePosixPath
+import anyio
+from typing import Optional
+from pydantic import TypeAdapter
+import hashlib
 import uvicorn
-import shutil
 import os
 import uuid
 
-# Create all tables (Base now includes workflow tables)
-models.Base.metadata.create_all(bind=database.engine)
+# Local setups migrate (and seed) on boot. Deployments leave this off and run
+# `alembic upgrade head` once per release instead of once per worker.
+AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "0" if database.DATABASE_URL else "1") != "0"
+# Seeding follows a schema migration; set RUN_SEED=0 to skip it even then
+RUN_SEED = os.getenv("RUN_SEED", "1") != "0"
 
-app = FastAPI(title="DuoText Platform API")
+ALEMBIC_CONFIG = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+# Newest revision shipped with this build, read once per process
+ALEMBIC_HEAD = ScriptDirectory.from_config(ALEMBIC_CONFIG).get_current_head()
+
+def schema_revision():
+    """Revision recorded in the database, or None if it was never migrated."""
+    try:
+        with database.engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+def migrate_database():
+    with database.engine.begin() as conn:
+        ALEMBIC_CONFIG.attributes["connection"] = conn
+        command.upgrade(ALEMBIC_CONFIG, "head")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync endpoints hold a worker thread for the whole DB round-trip; the default
+    # 40 threads would leave part of the PostgreSQL pool idle under load.
+    if database.DATABASE_URL:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = database.POOL_SIZE + database.MAX_OVERFLOW
+    # Hot boot: one SELECT, then no schema or seed work at all
+    current = await anyio.to_thread.run_sync(schema_revision)
+    if current != ALEMBIC_HEAD:
+        if AUTO_CREATE_TABLES:
+            await anyio.to_thread.run_sync(migrate_database)
+            if RUN_SEED:
+                await anyio.to_thread.run_sync(seed_data)
+        else:
+            print(f"Database schema at revision {current}, expected {ALEMBIC_HEAD}: run 'alembic upgrade head'")
+    yield
+
+app = FastAPI(title="DuoText Platform API", lifespan=lifespan)
+
+# Uploaded media is served by the app unless a reverse proxy in front serves the
+# directories itself (SERVE_MEDIA=0), e.g. with nginx:
+#   location /uploads/ { alias /app/app/uploads/; sendfile on; expires 30d; }
+#   location /static/  { alias /app/static/;      sendfile on; expires 30d; }
+SERVE_MEDIA = os.getenv("SERVE_MEDIA", "1") != "0"
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+if SERVE_MEDIA:
+    app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Register routers
 app.include_router(workflows_router, prefix="/api")
@@ -36,41 +97,42 @@ app.include_router(messaging_router, prefix="/api", tags=["messaging"])
 app.include_router(upload_router, prefix="/api", tags=["upload"])
 app.include_router(users_router, prefix="/api/users", tags=["users"])
 
-# Dependency
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 # CORS configuration - supports environment variable for production
-import os as os_module
-
-cors_origins_env = os_module.getenv("CORS_ORIGINS", "")
-origins = [
-    "http://localhost:5173",  # Vite default
-    "http://localhost:5174",  # Vite fallback
-    "http://localhost:3000",
-]
-# Add production origins from environment
-if cors_origins_env:
-    origins.extend([origin.strip() for origin in cors_origins_env.split(",")])
+# Local dev servers (Vite, CRA, ...) on any port
+DEV_ORIGIN_REGEX = r"https?://localhost:\d+"
+# Production origins come from the environment; duplicates and blanks dropped, order kept
+origins = tuple(dict.fromkeys(filter(None, map(str.strip, os.getenv("CORS_ORIGINS", "").split(",")))))
+# Request headers browsers may send cross-origin: auth, JSON/multipart bodies, ETag
+# revalidation, and what XHR libraries and no-cache fetches add. Starlette always
+# allows Accept, Accept-Language and Content-Language. Extra ones via CORS_ALLOW_HEADERS.
+CORS_ALLOW_HEADERS = tuple(dict.fromkeys([
+    "Authorization", "Content-Type", "If-None-Match", "If-Modified-Since",
+    "X-Requested-With", "Cache-Control", "Pragma",
+    *filter(None, map(str.strip, os.getenv("CORS_ALLOW_HEADERS", "").split(","))),
+]))
+
+app.add_middleware(database.DBSessionMiddleware)
+
+# List responses repeat usernames and role names; small bodies are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    allow_origin_regex=DEV_ORIGIN_REGEX,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Fixed lists: preflight answers are precomputed instead of echoing the request
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=CORS_ALLOW_HEADERS,
 )
 
 # Ensure upload directory exists
 os.makedirs("app/uploads", exist_ok=True)
 
 # Mount static files
-app.mount("/uploads", StaticFiles(directory="app/uploads"), name="uploads")
+if SERVE_MEDIA:
+    app.mount("/uploads", StaticFiles(directory="app/uploads"), name="uploads")
 
 @app.get("/")
 def read_root():
@@ -78,94 +140,85 @@ def read_root():
 
 # --- Auth Logic ---
 from fastapi.security import OAuth2PasswordRequestForm
-from app.auth import verify_password, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES, get_current_user
+from app.auth import verify_and_update_password, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES, get_current_user, require_staff
 from datetime import datetime, timedelta
 
 @app.post("/token", response_model=schemas.Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Sync on purpose: password hashing is CPU-bound and must not run on the event loop
     user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = verify_and_update_password(form_data.password, user.hashed_password) if user else (False, None)
+    if not verified:
         raise HTTPException(
             status_code=401,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Legacy bcrypt hash: upgrade to argon2 while we have the plain password
+        user.hashed_password = new_hash
+        db.commit()
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-class UserCreate(schemas.BaseModel):
-    username: str
-    email: str
-    password: str
+# Role ids by name. Roles are only created by the seeders and never renamed,
+# so register and the role endpoints can skip the lookup almost always.
+_role_id_cache = TTLCache(maxsize=16, ttl=300)
 
-@app.post("/api/register", response_model=schemas.User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter((models.User.username == user.username) | (models.User.email == user.email)).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Username or Email already registered")
-    
-    user_role = db.query(models.Role).filter(models.Role.name == "user").first()
-    if not user_role:
-        raise HTTPException(status_code=500, detail="Default role configuration missing")
+def get_role_id(db: Session, name: str):
+    role_id = _role_id_cache.get(name)
+    if role_id is None:
+        role_id = db.query(models.Role.id).filter(models.Role.name == name).scalar()
+        if role_id is not None:
+            _role_id_cache.set(name, role_id)
+    return role_id
 
-    hashed_pw = get_password_hash(user.password)
+def create_user(db: Session, user: schemas.UserCreate, role_id: int):
     new_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_pw,
-        role_id=user_role.id,
+        **user.model_dump(include={"username", "email"}),
+        hashed_password=get_password_hash(user.password),
+        role_id=role_id,
         is_active=True
     )
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
     return new_user
 
+@app.post("/api/register", response_model=schemas.User)
+def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    # Sync like the login route: the password hash runs on a threadpool worker, not the event loop
+    taken = db.query(models.User.id).filter((models.User.username == user.username) | (models.User.email == user.email)).exists()
+    if db.query(taken).scalar():
+        raise HTTPException(status_code=400, detail="Username or Email already registered")
+    
+    user_role_id = get_role_id(db, "user")
+    if user_role_id is None:
+        raise HTTPException(status_code=500, detail="Default role configuration missing")
+
+    return create_user(db, user, user_role_id)
+
 @app.get("/users/me", response_model=schemas.User)
 async def read_users_me(current_user: schemas.User = Depends(get_current_user)):
     return current_user
 
 # --- User Management ---
-class UserAdminCreate(schemas.BaseModel):
-    username: str
-    email: str
-    password: str
-    role_name: str
-
 @app.post("/api/users", response_model=schemas.User)
-def create_user_admin(user: UserAdminCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    db_user = db.query(models.User).filter((models.User.username == user.username) | (models.User.email == user.email)).first()
-    if db_user:
+def create_user_admin(user: schemas.UserAdminCreate, db: Session = Depends(get_db), current_user: models.User = Depends(require_staff)):
+    taken = db.query(models.User.id).filter((models.User.username == user.username) | (models.User.email == user.email)).exists()
+    if db.query(taken).scalar():
         raise HTTPException(status_code=400, detail="Username or Email already registered")
     
-    role = db.query(models.Role).filter(models.Role.name == user.role_name).first()
-    if not role:
+    role_id = get_role_id(db, user.role_name)
+    if role_id is None:
         raise HTTPException(status_code=400, detail="Role not found")
 
-    hashed_pw = get_password_hash(user.password)
-    new_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_pw,
-        role_id=role.id,
-        is_active=True
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return create_user(db, user, role_id)
 
 @app.delete("/api/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
+def delete_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(require_staff)):
     if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="You cannot delete yourself")
 
@@ -178,11 +231,8 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: model
     return {"message": "User deleted successfully"}
 
 @app.get("/api/users", response_model=list[schemas.User])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    # Simple admin check
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    users = db.query(models.User).offset(skip).limit(limit).all()
+def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(require_staff)):
+    users = db.query(models.User).options(joinedload(models.User.role)).offset(skip).limit(limit).all()
     return users
 
 class UserRoleUpdate(schemas.BaseModel):
@@ -193,22 +243,19 @@ def update_user_role(
     user_id: int, 
     role_update: UserRoleUpdate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    role = db.query(models.Role).filter(models.Role.name == role_update.role_name).first()
-    if not role:
+    role_id = get_role_id(db, role_update.role_name)
+    if role_id is None:
         raise HTTPException(status_code=400, detail="Role not found")
     
-    user.role_id = role.id
+    user.role_id = role_id
     db.commit()
-    return {"message": f"User role updated to {role.name}"}
+    return {"message": f"User role updated to {role_update.role_name}"}
 
 # --- Role Management API ---
 class RoleUpdate(schemas.BaseModel):
@@ -223,9 +270,7 @@ class RoleOut(schemas.BaseModel):
         from_attributes = True
 
 @app.get("/api/roles", response_model=list[RoleOut])
-def read_roles(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def read_roles(db: Session = Depends(get_db), current_user: models.User = Depends(require_staff)):
     return db.query(models.Role).all()
 
 @app.put("/api/roles/{role_id}")
@@ -233,11 +278,8 @@ def update_role_permissions(
     role_id: int,
     role_update: RoleUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(require_staff)
 ):
-    if current_user.role.name not in ["admin", "engineer"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     role = db.query(models.Role).filter(models.Role.id == role_id).first()
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
@@ -265,31 +307,45 @@ class ChatMessageOut(schemas.BaseModel):
     class Config:
         from_attributes = True
 
-@app.get("/api/chat", response_model=list[ChatMessageOut])
-def get_chat_messages(limit: int = 50, db: Session = Depends(get_db)):
-    msgs = db.query(models.ChatMessage).order_by(models.ChatMessage.timestamp.desc()).limit(limit).all()
-    # Manual mapping to avoid circular deps or complex nested schemas
-    result = []
-    for m in msgs:
-        role_name = m.user.role.name if m.user and m.user.role else "user"
-        result.append({
+@app.get("/api/chat", responses={200: {"model": Page[ChatMessageOut]}})
+def get_chat_messages(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Newest messages first. Pass `next_cursor` back as `cursor` for older ones.
+    """
+    # Plain column rows with author and role joined in: no ORM objects to hydrate
+    query = db.query(
+        models.ChatMessage.id,
+        models.ChatMessage.content,
+        models.ChatMessage.timestamp,
+        models.User.id.label("user_id"),
+        models.User.username,
+        models.Role.name.label("role_name"),
+    ).outerjoin(models.ChatMessage.user).outerjoin(models.User.role)
+    page = paginate(query, models.ChatMessage.timestamp, models.ChatMessage.id, limit, cursor=cursor)
+    items = [
+        {
             "id": m.id,
             "content": m.content,
             "timestamp": m.timestamp,
             "user": {
-                "id": m.user.id if m.user else 0,
-                "username": m.user.username if m.user else "Unknown",
-                "role_name": role_name
-            }
-        })
-    return result # Returns newest first
+                "id": m.user_id or 0,
+                "username": m.username or "Unknown",
+                "role_name": m.role_name or "user",
+            },
+        }
+        for m in page["items"]
+    ]
+    return ORJSONResponse({"items": items, "next_cursor": page["next_cursor"]})
 
 @app.post("/api/chat", response_model=ChatMessageOut)
 def post_chat_message(msg: ChatMessageCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     new_msg = models.ChatMessage(content=msg.content, user_id=current_user.id)
     db.add(new_msg)
     db.commit()
-    db.refresh(new_msg)
     
     role_name = current_user.role.name if current_user.role else "user"
     return {
@@ -305,9 +361,31 @@ def post_chat_message(msg: ChatMessageCreate, db: Session = Depends(get_db), cur
 
 # --- Project & Comment Endpoints ---
 
+# Rendered project and comment payloads as (etag, body). Writes in this process
+# evict their entries; other workers catch up within the TTL.
+_project_cache = TTLCache(maxsize=256, ttl=10)
+_comments_cache = TTLCache(maxsize=256, ttl=10)
+COMMENT_LIST_ADAPTER = TypeAdapter(list[schemas.Comment])
+
+def _etag_entry(body: bytes):
+    return (f'"{hashlib.sha1(body).hexdigest()}"', body)
+
+def _etag_response(request: Request, cached) -> Response:
+    etag, body = cached
+    headers = {"ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _invalidate_project_cache(project_id: int):
+    # The project payload embeds its comments, so both go together
+    _project_cache.pop(project_id)
+    _comments_cache.pop(project_id)
+
 @app.get("/api/projects", response_model=list[schemas.Project])
 def read_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    projects = db.query(models.Project).offset(skip).limit(limit).all()
+    # Each project carries its comments: one extra IN query instead of one per project
+    projects = db.query(models.Project).options(selectinload(models.Project.comments)).offset(skip).limit(limit).all()
     return projects
 
 @app.post("/api/projects", response_model=schemas.Project)
@@ -315,15 +393,18 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
     db_project = models.Project(**project.dict())
     db.add(db_project)
     db.commit()
-    db.refresh(db_project)
     return db_project
 
-@app.get("/api/projects/{project_id}", response_model=schemas.Project)
-def read_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+@app.get("/api/projects/{project_id}", responses={200: {"model": schemas.Project}})
+def read_project(project_id: int, request: Request, db: Session = Depends(get_db)):
+    cached = _project_cache.get(project_id)
+    if cached is None:
+        project = db.query(models.Project).options(selectinload(models.Project.comments)).filter(models.Project.id == project_id).first()
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        cached = _etag_entry(schemas.Project.model_validate(project).model_dump_json().encode())
+        _project_cache.set(project_id, cached)
+    return _etag_response(request, cached)
 
 @app.put("/api/projects/{project_id}", response_model=schemas.Project)
 def update_project(
@@ -337,39 +418,42 @@ def update_project(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Track activity
+    pending_logs = []
     if project_update.version and project_update.version != project.version:
-        log = models.ActivityLog(
-            user_id=current_user.id,
-            project_id=project_id,
-            action=f"Updated version to {project_update.version}"
-        )
-        db.add(log)
+        pending_logs.append({
+            "user_id": current_user.id,
+            "project_id": project_id,
+            "action": f"Updated version to {project_update.version}"
+        })
     
     if project_update.status and project_update.status != project.status:
-        log = models.ActivityLog(
-            user_id=current_user.id,
-            project_id=project_id,
-            action=f"Changed status to {project_update.status}"
-        )
-        db.add(log)
+        pending_logs.append({
+            "user_id": current_user.id,
+            "project_id": project_id,
+            "action": f"Changed status to {project_update.status}"
+        })
+    if pending_logs:
+        # One multi-row INSERT for all the entries
+        db.execute(insert(models.ActivityLog), pending_logs)
 
     # Apply updates
     update_data = project_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(project, key, value)
     
+    # expire_on_commit=False: the assigned values are what gets returned, no re-SELECT
     db.commit()
-    db.refresh(project)
+    _invalidate_project_cache(project_id)
     return project
 
 @app.get("/api/activity-logs", response_model=list[schemas.ActivityLog])
 def read_activity_logs(limit: int = 10, db: Session = Depends(get_db)):
-    logs = db.query(models.ActivityLog).order_by(models.ActivityLog.timestamp.desc()).limit(limit).all()
-    # Populate username helper manually or via relationship
-    for log in logs:
-        if log.user:
-            log.username = log.user.username
-    return logs
+    # Authors come in the same query; the schema reads username from log.user
+    return db.query(models.ActivityLog)\
+        .options(joinedload(models.ActivityLog.user))\
+        .order_by(models.ActivityLog.timestamp.desc())\
+        .limit(limit)\
+        .all()
 
 @app.post("/api/projects/{project_id}/comments", response_model=schemas.Comment)
 def create_comment(project_id: int, comment: schemas.CommentCreate, db: Session = Depends(get_db)):
@@ -379,13 +463,17 @@ def create_comment(project_id: int, comment: schemas.CommentCreate, db: Session
     
     db.add(db_comment)
     db.commit()
-    db.refresh(db_comment)
+    _invalidate_project_cache(project_id)
     return db_comment
 
-@app.get("/api/projects/{project_id}/comments", response_model=list[schemas.Comment])
-def read_comments(project_id: int, db: Session = Depends(get_db)):
-    comments = db.query(models.Comment).filter(models.Comment.project_id == project_id).all()
-    return comments
+@app.get("/api/projects/{project_id}/comments", responses={200: {"model": list[schemas.Comment]}})
+def read_comments(project_id: int, request: Request, db: Session = Depends(get_db)):
+    cached = _comments_cache.get(project_id)
+    if cached is None:
+        comments = db.query(models.Comment).filter(models.Comment.project_id == project_id).all()
+        cached = _etag_entry(COMMENT_LIST_ADAPTER.dump_json(COMMENT_LIST_ADAPTER.validate_python(comments, from_attributes=True)))
+        _comments_cache.set(project_id, cached)
+    return _etag_response(request, cached)
 
 # Review Endpoints
 @app.post("/api/projects/{project_id}/reviews", response_model=schemas.ReviewThread)
@@ -393,7 +481,6 @@ def create_review_thread(project_id: int, review: schemas.ReviewThreadCreate, db
     db_review = models.ReviewThread(**review.model_dump(), project_id=project_id)
     db.add(db_review)
     db.commit()
-    db.refresh(db_review)
     return db_review
 
 @app.get("/api/projects/{project_id}/reviews", response_model=list[schemas.ReviewThread])
@@ -415,7 +502,6 @@ def create_review_comment(
     )
     db.add(db_comment)
     db.commit()
-    db.refresh(db_comment)
     return db_comment
 
 @app.put("/api/reviews/comments/{comment_id}", response_model=schemas.ReviewComment)
@@ -440,7 +526,6 @@ def update_review_comment(
         db_comment.dislikes = comment_update.dislikes
 
     db.commit()
-    db.refresh(db_comment)
     return db_comment
 
 @app.get("/api/reviews/{thread_id}/comments", response_model=list[schemas.ReviewComment])
@@ -457,73 +542,22 @@ def update_review_status(thread_id: int, status: str, db: Session = Depends(get_
     return {"message": "Status updated"}
 
 
-# Seeding Logic Update
-@app.on_event("startup")
-async def seed_data():
-    db = database.SessionLocal()
-    try:
-        # Seed Project
-        project = db.query(models.Project).filter(models.Project.title == "Text Editor").first()
-        if not project:
-            editor_tool = models.Project(
-                title="Text Editor",
-                description="A rich text editor with live preview, word import, and image support.",
-                status=models.ProjectStatus.IN_PROGRESS.value
-            )
-            db.add(editor_tool)
-            db.commit()
-            print("Seeded 'Text Editor' project.")
-        
-        # Seed Roles & Permissions
-        roles_data = [
-            {"name": "admin", "permissions": "*"},
-            {"name": "engineer", "permissions": "*"},
-            {"name": "editor", "permissions": "view:content,edit:content,publish:content"},
-            {"name": "author", "permissions": "view:own_content,edit:own_content"},
-            {"name": "user", "permissions": "view:public"}
-        ]
-        
-        for r_data in roles_data:
-            role = db.query(models.Role).filter(models.Role.name == r_data["name"]).first()
-            if not role:
-                db.add(models.Role(name=r_data["name"], permissions=r_data["permissions"]))
-            else:
-                # Update permissions if changed
-                if role.permissions != r_data["permissions"]:
-                    role.permissions = r_data["permissions"]
-        
-        db.commit()
-
-        # Seed Admin User
-        admin_user = db.query(models.User).filter(models.User.username == "admin").first()
-        if not admin_user:
-            hashed_pw = get_password_hash("admin") # User requested admin/admin
-            admin_role = db.query(models.Role).filter(models.Role.name == "admin").first()
-            db.add(models.User(username="admin", email="admin@lava.com", hashed_password=hashed_pw, role_id=admin_role.id))
-            db.commit()
-            print("Seeded 'admin' user.")
-        else:
-            # Update password if needed (for dev convenience)
-            # hashed_pw = get_password_hash("admin")
-            # admin_user.hashed_password = hashed_pw
-            pass
-
-    finally:
-        db.close()
-
 @app.post("/api/upload-image")
 async def upload_image(file: UploadFile = File(...)):
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
     
+    # Only the suffix of the client's name is kept, and only if it is a known image type
+    suffix = PurePosixPath(file.filename or "").suffix.lower()
+    if suffix not in IMAGE_SUFFIXES:
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
+
     # Generate unique filename
-    extension = file.filename.split(".")[-1]
-    filename = f"{uuid.uuid4()}.{extension}"
+    filename = f"{uuid.uuid4().hex}{suffix}"
     file_path = f"app/uploads/{filename}"
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
+    await save_upload_file(file, file_path)
+
     return {"url": f"http://localhost:8000/uploads/{filename}"}
 
 @app.post("/api/import-docx")
@@ -538,4 +572,4 @@ async def import_docx(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools")
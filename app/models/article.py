@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Index, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
-from ..database import Base
+from ..database import Base, utcnow
 
 class ArticleStatus(str, enum.Enum):
     DRAFT = "DRAFT"
@@ -24,13 +24,24 @@ class Article(Base):
     
     status = Column(Enum(ArticleStatus), default=ArticleStatus.DRAFT)
     category = Column(String, index=True, nullable=True)
-    tags = Column(String, nullable=True) # Comma separated
+    # List of strings: JSONB on PostgreSQL (GIN-indexed for containment), JSON text on SQLite
+    tags = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
     
     author_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps come from the DB clock (rendered into the INSERT/UPDATE); columns keep no
+    # server default so existing tables need no migration
+    created_at = Column(DateTime, default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), onupdate=utcnow())
     published_at = Column(DateTime, nullable=True)
     
+    # Keyset pagination indexes for the public and admin listings
+    __table_args__ = (
+        Index("ix_articles_published_at_id", published_at.desc(), id.desc()),
+        Index("ix_articles_created_at_id", created_at.desc(), id.desc()),
+        # Tag lookups (tags @> '["x"]'); SQLite has no index type that would help
+        Index("ix_articles_tags", tags, postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+    
     # Relationships
     author = relationship("User", foreign_keys=[author_id])
     reviews = relationship("ArticleReview", back_populates="article", cascade="all, delete-orphan")
@@ -44,7 +55,7 @@ class ArticleReview(Base):
     
     status = Column(String) # APPROVED, CHANGES_REQUESTED
     comments = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow())
 
     # Relationships
     article = relationship("Article", back_populates="reviews")
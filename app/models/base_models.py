@@ -1,8 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
-from ..database import Base
+from ..database import Base, utcnow
 
 class ProjectStatus(str, enum.Enum):
     BACKLOG = "BACKLOG"
@@ -19,7 +18,7 @@ class Project(Base):
     version = Column(String, default="0.0.1")
     summary = Column(Text, nullable=True)
     checklist = Column(Text, default="[]") # JSON string of completed checks
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow())
 
     comments = relationship("Comment", back_populates="project", cascade="all, delete-orphan")
 
@@ -35,7 +34,13 @@ class ActivityLog(Base):
     details = Column(Text, nullable=True) # JSON or text details
     resource_type = Column(String, default="system") # project, page, system, auth
     
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=utcnow())
+
+    __table_args__ = (
+        Index("ix_activity_logs_timestamp_id", timestamp.desc(), id.desc()),
+        # Per-page feed: equality on page_id, then rows already in (timestamp, id) order
+        Index("ix_activity_logs_page_timestamp_id", page_id, timestamp.desc(), id.desc()),
+    )
 
     user = relationship("User")
     project = relationship("Project")
@@ -46,11 +51,16 @@ class Comment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow())
     project_id = Column(Integer, ForeignKey("projects.id"))
 
     project = relationship("Project", back_populates="comments")
 
+    __table_args__ = (
+        # A project's comments, already in id order
+        Index("ix_comments_project_id_id", project_id, id),
+    )
+
 from sqlalchemy.sql import func
 
 class ReviewThread(Base):
@@ -68,6 +78,10 @@ class ReviewThread(Base):
 
     comments = relationship("ReviewComment", back_populates="thread", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_review_threads_project_id_id", project_id, id),
+    )
+
 class ReviewComment(Base):
     __tablename__ = "review_comments"
 
@@ -84,6 +98,10 @@ class ReviewComment(Base):
     thread = relationship("ReviewThread", back_populates="comments")
     author = relationship("User") # Relationship to User
 
+    __table_args__ = (
+        Index("ix_review_comments_thread_id_id", thread_id, id),
+    )
+
 class Role(Base):
     __tablename__ = "roles"
 
@@ -119,6 +137,11 @@ class ChatMessage(Base):
     
     user = relationship("User", back_populates="messages")
 
+    __table_args__ = (
+        # Newest-first chat history with keyset paging
+        Index("ix_chat_messages_timestamp_id", timestamp.desc(), id.desc()),
+    )
+
 # ========== E-COMMERCE MODELS ==========
 
 class ProductCategory(Base):
@@ -132,6 +155,14 @@ class ProductCategory(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Public storefront only ever reads active categories
+        Index(
+            "ix_product_categories_active", id,
+            postgresql_where=is_active == True, sqlite_where=is_active == True,
+        ),
+    )
+
     products = relationship("Product", back_populates="category")
 
 class ProductType(str, enum.Enum):
@@ -161,6 +192,14 @@ class Product(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Public slug lookups skip deactivated products entirely
+        Index(
+            "ix_products_active_slug", slug,
+            postgresql_where=is_active == True, sqlite_where=is_active == True,
+        ),
+    )
+
     category = relationship("ProductCategory", back_populates="products")
     order_items = relationship("OrderItem", back_populates="product")
 
@@ -189,6 +228,14 @@ class SubscriptionPlan(Base):
     sort_order = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Public plan list: active plans already in display order
+        Index(
+            "ix_subscription_plans_active_sort_order", sort_order,
+            postgresql_where=is_active == True, sqlite_where=is_active == True,
+        ),
+    )
+
     subscriptions = relationship("UserSubscription", back_populates="plan")
 
 class OrderStatus(str, enum.Enum):
@@ -317,6 +364,11 @@ class ChannelMember(Base):
     notifications_enabled = Column(Boolean, default=True)
     sound_enabled = Column(Boolean, default=True)
 
+    __table_args__ = (
+        # get_user_membership and the membership joins
+        Index("ix_channel_members_channel_user", channel_id, user_id),
+    )
+
     channel = relationship("ChatChannel", back_populates="members")
     user = relationship("User")
 
@@ -334,6 +386,12 @@ class ChannelMessage(Base):
     is_system_message = Column(Boolean, default=False)  # "X joined the channel"
     reply_to_id = Column(Integer, ForeignKey("channel_messages.id"), nullable=True)  # Thread support
 
+    __table_args__ = (
+        # Newest-first history and last message per channel; user_id lets the
+        # unread counts filter out own messages from the index alone
+        Index("ix_channel_messages_channel_timestamp_user", channel_id, timestamp.desc(), user_id),
+    )
+
     channel = relationship("ChatChannel", back_populates="messages")
     user = relationship("User")
     reply_to = relationship("ChannelMessage", remote_side=[id])
@@ -350,6 +408,11 @@ class MessageReaction(Base):
     emoji = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # One reaction per (message, user, emoji); also the ON CONFLICT target for toggling
+        Index("ix_message_reactions_message_user_emoji", message_id, user_id, emoji, unique=True),
+    )
+
     message = relationship("ChannelMessage", back_populates="reactions")
     user = relationship("User")
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from ..database import Base
 
@@ -14,9 +15,9 @@ class BuilderPage(Base):
     slug = Column(String, unique=True, index=True)  # URL-friendly name
     description = Column(Text, nullable=True)
     
-    # Page content (JSON)
-    widgets_json = Column(Text, default="[]")  # Array of widget definitions
-    theme_json = Column(Text, nullable=True)   # Theme settings
+    # Page content: JSONB on PostgreSQL, JSON text on SQLite (converted by revision 0006)
+    widgets_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), default=list)  # Array of widget definitions
+    theme_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)   # Theme settings
     
     # Metadata
     is_published = Column(Boolean, default=False)
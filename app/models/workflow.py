@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -18,9 +19,9 @@ class Workflow(Base):
     trigger_type = Column(String, default="manual")  # manual, schedule, webhook, event
     trigger_config = Column(Text, nullable=True)  # JSON config for trigger
     
-    # Graph structure (stored as JSON)
-    nodes_json = Column(Text, default="[]")  # Array of WorkflowNode
-    edges_json = Column(Text, default="[]")  # Array of {source, target, sourceHandle, targetHandle}
+    # Graph structure: JSONB on PostgreSQL, JSON text on SQLite (converted by revision 0007)
+    nodes_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), default=list)  # Array of WorkflowNode
+    edges_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), default=list)  # Array of {source, target, sourceHandle, targetHandle}
     
     # Metadata
     is_active = Column(Boolean, default=True)
@@ -59,6 +60,16 @@ class WorkflowExecution(Base):
     # Timestamps
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Per-workflow history, newest first. On PostgreSQL the small summary
+        # columns ride along in the index (error_message is unbounded text, so not it)
+        Index(
+            "ix_workflow_executions_workflow_started_id",
+            workflow_id, started_at.desc(), id.desc(),
+            postgresql_include=["status", "completed_at"],
+        ),
+    )
     
     # Relationships
     workflow = relationship("Workflow", back_populates="executions")
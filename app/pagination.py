@@ -0,0 +1,96 @@
+"""
+Keyset (cursor) pagination helpers shared by the list endpoints.
+
+Rows are ordered by a sort column plus `id` as a tiebreaker, and the next page
+is fetched with a `(sort, id) < (last_sort, last_id)` seek instead of OFFSET.
+Rows without a sort value come first, as PostgreSQL orders NULLs for DESC
+indexes, and the cursor carries the NULL so they page like any other value.
+"""
+
+import base64
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, tuple_
+
+T = TypeVar("T")
+
+# Upper bound for the `limit` query parameter
+MAX_PAGE_SIZE = 200
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    # An empty sort part stands for NULL
+    raw = f"{sort_value.isoformat() if sort_value is not None else ''}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_value, row_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(sort_value) if sort_value else None), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset(query, sort_column, id_column, limit: int, cursor: Optional[str]):
+    if cursor:
+        last_sort, last_id = decode_cursor(cursor)
+        if last_sort is None:
+            # Still among the NULLs: the rest of them, then every dated row
+            query = query.filter(or_(and_(sort_column.is_(None), id_column < last_id), sort_column.is_not(None)))
+        else:
+            # NULL compares as unknown, so no NULL row can match here
+            query = query.filter(tuple_(sort_column, id_column) < (last_sort, last_id))
+    query = query.order_by(sort_column.desc().nulls_first(), id_column.desc())
+    return query.limit(limit)
+
+
+def _next_cursor(last, count: int, limit: int, sort_column, id_column) -> Optional[str]:
+    if last is None or count < limit:
+        return None
+    return encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def paginate(query, sort_column, id_column, limit: int, cursor: Optional[str] = None):
+    """Return one page of `query` ordered by (sort_column, id_column) desc."""
+    rows = _keyset(query, sort_column, id_column, limit, cursor).all()
+    next_cursor = _next_cursor(rows[-1] if rows else None, len(rows), limit, sort_column, id_column)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def stream_page(query, sort_column, id_column, limit: int, schema, cursor: Optional[str] = None, chunk_size: int = 100):
+    """
+    Same page as `paginate`, returned as a StreamingResponse.
+
+    Rows are fetched `chunk_size` at a time and each one is encoded with `schema`
+    as it arrives, so the full result set and its JSON never sit in memory together.
+    The first chunk is encoded before the response starts: a failing query or a row
+    the schema rejects there still turns into an error status, not a cut-off 200.
+    Loader options must be compatible with yield_per (selectinload, not joined collections).
+    """
+    rows = iter(_keyset(query, sort_column, id_column, limit, cursor).yield_per(chunk_size))
+    first = list(islice(rows, chunk_size))
+    head = b",".join(schema.model_validate(row).model_dump_json().encode() for row in first)
+
+    def body():
+        yield b'{"items":[' + head
+        last, count = (first[-1] if first else None), len(first)
+        for row in rows:
+            yield b"," + schema.model_validate(row).model_dump_json().encode()
+            last, count = row, count + 1
+        next_cursor = _next_cursor(last, count, limit, sort_column, id_column)
+        yield b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+
+    return StreamingResponse(body(), media_type="application/json")
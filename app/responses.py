@@ -0,0 +1,33 @@
+"""
+Response classes shared by the routers.
+"""
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    Meant for handlers that already build plain dicts: returning it directly skips
+    response_model validation and jsonable_encoder. datetimes are encoded natively.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match covers `etag`: `*`, or any listed tag
+    once the weak `W/` prefix is dropped (GET uses weak comparison).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
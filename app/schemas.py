@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import AliasPath, BaseModel, BeforeValidator, Field
+from typing import Annotated, List, Optional
 from datetime import datetime
 
 class CommentBase(BaseModel):
@@ -49,10 +49,8 @@ class ActivityLog(ActivityLogBase):
     id: int
     user_id: Optional[int] = None
     timestamp: datetime
-    username: Optional[str] = None # Helper
-
-    class Config:
-        from_attributes = True
+    # Read straight off the eager-loaded author
+    username: Optional[str] = Field(None, validation_alias=AliasPath("user", "username"))
 
     class Config:
         from_attributes = True
@@ -116,8 +114,12 @@ class UserBase(BaseModel):
     email: str | None = None
 
 class UserCreate(UserBase):
+    email: str
     password: str
 
+class UserAdminCreate(UserCreate):
+    role_name: str
+
 class RoleBase(BaseModel):
     name: str
 
@@ -152,6 +154,14 @@ class ArticleStatusEnum(str): # Mirror the enum for pydantic
     PUBLISHED = "PUBLISHED"
     ARCHIVED = "ARCHIVED"
 
+def _split_tags(value):
+    # Older clients send tags as one comma-separated string
+    if isinstance(value, str):
+        return [tag.strip() for tag in value.split(",") if tag.strip()]
+    return value
+
+TagList = Annotated[List[str], BeforeValidator(_split_tags)]
+
 class ArticleBase(BaseModel):
     title: str
     slug: str
@@ -160,7 +170,7 @@ class ArticleBase(BaseModel):
     cover_image: Optional[str] = None
     status: Optional[str] = "DRAFT"
     category: Optional[str] = None
-    tags: Optional[str] = None
+    tags: Optional[TagList] = None
 
 class ArticleCreate(ArticleBase):
     pass
@@ -173,7 +183,7 @@ class ArticleUpdate(BaseModel):
     cover_image: Optional[str] = None
     status: Optional[str] = None
     category: Optional[str] = None
-    tags: Optional[str] = None
+    tags: Optional[TagList] = None
 
 class ArticleReviewBase(BaseModel):
     status: str
@@ -204,3 +214,23 @@ class Article(ArticleBase):
 
     class Config:
         from_attributes = True
+
+class ArticleListItem(BaseModel):
+    # List views: no content body or reviews
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    cover_image: Optional[str] = None
+    status: Optional[str] = "DRAFT"
+    category: Optional[str] = None
+    tags: Optional[TagList] = None
+    # Nullable columns: a legacy row without them must not abort a streamed page
+    author_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+    author: Optional[User] = None
+
+    class Config:
+        from_attributes = True
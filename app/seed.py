@@ -0,0 +1,69 @@
+"""
+Default data: the showcase project, the roles and the admin user.
+
+Local setups seed on boot after migrating (see the lifespan in main.py);
+deployments run `python -m app.seed` once per release. Safe to run repeatedly,
+including from several processes at once.
+"""
+
+from sqlalchemy import select
+
+from app import models
+from app.auth import get_password_hash
+from app.database import SessionLocal, dialect_insert
+
+ROLES = [
+    {"name": "admin", "permissions": "*"},
+    {"name": "engineer", "permissions": "*"},
+    {"name": "editor", "permissions": "view:content,edit:content,publish:content"},
+    {"name": "author", "permissions": "view:own_content,edit:own_content"},
+    {"name": "user", "permissions": "view:public"}
+]
+
+
+def seed_data():
+    db = SessionLocal()
+    try:
+        # Seed Project
+        project = db.query(models.Project.id).filter(models.Project.title == "Text Editor").first()
+        if not project:
+            editor_tool = models.Project(
+                title="Text Editor",
+                description="A rich text editor with live preview, word import, and image support.",
+                status=models.ProjectStatus.IN_PROGRESS.value
+            )
+            db.add(editor_tool)
+            db.commit()
+            print("Seeded 'Text Editor' project.")
+
+        # Seed Roles & Permissions: one upsert, rewriting permissions only where they drifted
+        stmt = dialect_insert(models.Role).values(ROLES)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.Role.name],
+            set_={"permissions": stmt.excluded.permissions},
+            where=models.Role.permissions.is_distinct_from(stmt.excluded.permissions),
+        )
+        db.execute(stmt)
+        db.commit()
+
+        # Seed Admin User. The lookup spares the password hash on every run after the first;
+        # DO NOTHING covers a concurrent seeder winning the insert.
+        if not db.query(models.User.id).filter(models.User.username == "admin").first():
+            admin_role_id = select(models.Role.id).where(models.Role.name == "admin").scalar_subquery()
+            result = db.execute(
+                dialect_insert(models.User).values(
+                    username="admin",
+                    email="admin@lava.com",
+                    hashed_password=get_password_hash("admin"),  # User requested admin/admin
+                    role_id=admin_role_id,
+                ).on_conflict_do_nothing()
+            )
+            db.commit()
+            if result.rowcount:
+                print("Seeded 'admin' user.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    seed_data()
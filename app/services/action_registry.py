@@ -13,7 +13,7 @@ Each action has:
 
 from typing import Any, Dict, List, Callable
 from dataclasses import dataclass, field
-import json
+import orjson
 
 
 @dataclass
@@ -216,7 +216,7 @@ class ActionRegistry:
     
     async def _action_transform(self, context: Dict, config: Dict) -> Dict:
         template = config.get("template", {})
-        result = json.loads(json.dumps(template))  # Deep copy
+        result = orjson.loads(orjson.dumps(template))  # Deep copy
         # Simple variable replacement
         def replace_vars(obj):
             if isinstance(obj, str):
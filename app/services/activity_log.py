@@ -0,0 +1,22 @@
+"""
+Activity Log - Writes ActivityLog rows outside the request transaction.
+
+Endpoints schedule `write_activity_log` with FastAPI's BackgroundTasks so the
+log insert runs after the response is sent, in its own short-lived session.
+"""
+
+from ..database import SessionLocal
+from ..models.base_models import ActivityLog
+
+
+def write_activity_log(**fields):
+    """Insert one ActivityLog row. Failures are reported, never raised."""
+    db = SessionLocal()
+    try:
+        db.add(ActivityLog(**fields))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to create activity log: {e}")
+    finally:
+        db.close()
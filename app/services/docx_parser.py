@@ -1,13 +1,21 @@
 from docx import Document
-import io
+import anyio
 
 async def parse_docx(file) -> str:
     """
-    Parses a DOCX file and converts it to basic HTML.
+    Parses an uploaded DOCX file and converts it to basic HTML.
+    The XML parsing is CPU-bound, so it runs in a worker thread straight from
+    the upload's spooled file instead of on the event loop.
+    """
+    await file.seek(0)
+    return await anyio.to_thread.run_sync(docx_to_html, file.file)
+
+def docx_to_html(source) -> str:
+    """
+    Converts a DOCX file (path or binary file object) to basic HTML.
     Handles headings, paragraphs, bold, and italic formatting.
     """
-    content = await file.read()
-    doc = Document(io.BytesIO(content))
+    doc = Document(source)
     
     html_output = []
     
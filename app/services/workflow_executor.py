@@ -2,15 +2,23 @@
 Workflow Executor - Executes workflow graphs by traversing nodes.
 """
 
-import json
+import orjson
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models.workflow import Workflow, WorkflowExecution
 from .action_registry import action_registry
 
 
+def _dumps(obj) -> str:
+    # Action results may carry datetimes or non-string keys; store them as text
+    # rather than failing the whole execution
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class WorkflowExecutor:
     """
     Executes a workflow by traversing its node graph.
@@ -25,16 +33,14 @@ class WorkflowExecutor:
         """
         Execute a workflow and return the execution record.
         """
-        # Create execution record
+        # Create execution record (started_at from the column's server default)
         execution = WorkflowExecution(
             workflow_id=workflow.id,
             status="running",
-            input_data=json.dumps(input_data or {}),
-            started_at=datetime.utcnow()
+            input_data=_dumps(input_data or {})
         )
         self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
+        await self._commit()
         
         try:
             # Initialize context
@@ -47,8 +53,8 @@ class WorkflowExecutor:
             self.execution_log = []
             
             # Parse workflow graph
-            nodes = json.loads(workflow.nodes_json or "[]")
-            edges = json.loads(workflow.edges_json or "[]")
+            nodes = workflow.nodes_json or []
+            edges = workflow.edges_json or []
             
             # Build adjacency list
             adjacency = self._build_adjacency(edges)
@@ -63,22 +69,29 @@ class WorkflowExecutor:
             
             # Mark as completed
             execution.status = "completed"
-            execution.output_data = json.dumps(self.context.get("variables", {}))
-            execution.completed_at = datetime.utcnow()
+            execution.output_data = _dumps(self.context.get("variables", {}))
+            execution.completed_at = func.now()
             
         except Exception as e:
             execution.status = "failed"
             execution.error_message = str(e)
-            execution.completed_at = datetime.utcnow()
+            execution.completed_at = func.now()
             self._log_step("error", {"message": str(e)})
         
         # Save execution log
-        execution.execution_log = json.dumps(self.execution_log)
-        self.db.commit()
-        self.db.refresh(execution)
+        execution.execution_log = _dumps(self.execution_log)
+        await self._commit()
         
         return execution
     
+    async def _commit(self):
+        """
+        Commit in a worker thread: execute() runs on the event loop, and a blocking
+        round-trip there would stall every other request. expire_on_commit is off,
+        so the execution keeps its values (and id) without a refresh.
+        """
+        await run_in_threadpool(self.db.commit)
+
     def _build_adjacency(self, edges: List[Dict]) -> Dict[str, List[Dict]]:
         """Build adjacency list from edges."""
         adjacency = {}
@@ -123,7 +136,7 @@ class WorkflowExecutor:
         
         # Update current node in execution
         execution.current_node_id = node_id
-        self.db.commit()
+        await self._commit()
         
         self._log_step("node_start", {"node_id": node_id, "type": node_type, "action": action_id})
         
@@ -5,6 +5,8 @@ import json
 # Add current directory to path so we can import app modules
 sys.path.append(os.getcwd())
 
+from sqlalchemy import insert
+
 from app.database import SessionLocal
 from app.models.base_models import Role, User
 from app.auth import get_password_hash
@@ -21,14 +23,19 @@ def seed_roles():
         {"name": "user", "permissions": ["view:public_content"]}
     ]
     
+    # One lookup for every role, then a single executemany INSERT for the missing ones
+    existing = {
+        name for (name,) in db.query(Role.name).filter(Role.name.in_([r["name"] for r in roles]))
+    }
+    missing = []
     for r in roles:
-        role = db.query(Role).filter(Role.name == r["name"]).first()
-        if not role:
-            role = Role(name=r["name"], permissions=json.dumps(r["permissions"]))
-            db.add(role)
-            print(f"Created role: {r['name']}")
-        else:
+        if r["name"] in existing:
             print(f"Role {r['name']} already exists")
+        else:
+            missing.append({"name": r["name"], "permissions": json.dumps(r["permissions"])})
+            print(f"Created role: {r['name']}")
+    if missing:
+        db.execute(insert(Role), missing)
     
     db.commit()
 